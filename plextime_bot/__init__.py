@@ -1,6 +1,12 @@
+from plextime_bot.config.constants import PLEXTIME_TENANTS_FILE, PLEXTIME_WORKERS
 from plextime_bot.plextime_bot import PlextimeBot
+from plextime_bot.plextime_supervisor import PlextimeSupervisor
 
 
 def start_plextime_bot() -> None:
-    plextime_bot = PlextimeBot()
-    plextime_bot.start()
+    if not PLEXTIME_TENANTS_FILE and PLEXTIME_WORKERS == 1:
+        plextime_bot = PlextimeBot()
+        plextime_bot.start()
+    else:
+        plextime_supervisor = PlextimeSupervisor(PLEXTIME_TENANTS_FILE, PLEXTIME_WORKERS)
+        plextime_supervisor.start()
@@ -41,8 +41,17 @@ PLEXTIME_CHECKOUT_JOURNAL_OPTION = getenv("PLEXTIME_CHECKOUT_JOURNAL_OPTION", "8
 PLEXTIME_CHECKIN_RANDOM_MARGIN = int(getenv("PLEXTIME_CHECKIN_RANDOM_MARGIN", "0"))
 PLEXTIME_CHECKOUT_RANDOM_MARGIN = int(getenv("PLEXTIME_CHECKOUT_RANDOM_MARGIN", "0"))
 PLEXTIME_ORIGIN = int(getenv("PLEXTIME_ORIGIN", "2"))
+PLEXTIME_PREWARM_LEAD_TIME = int(getenv("PLEXTIME_PREWARM_LEAD_TIME") or "60")
 PLEXTIME_CHECKIN_MESSAGE = "➡️ Check-in successfully completed on {checkin_datetime}"
 PLEXTIME_CHECKOUT_MESSAGE = "⬅️ Check-out successfully completed on {checkout_datetime}"
 PLEXTIME_TELEGRAM_NOTIFICATIONS = getenv("PLEXTIME_TELEGRAM_NOTIFICATIONS", "false") == "true"
 PLEXTIME_TELEGRAM_BOT_TOKEN = getenv("PLEXTIME_TELEGRAM_BOT_TOKEN", None)
 PLEXTIME_TELEGRAM_CHANNEL_ID = getenv("PLEXTIME_TELEGRAM_CHANNEL_ID", None)
+PLEXTIME_TENANTS_FILE = getenv("PLEXTIME_TENANTS_FILE", None)
+PLEXTIME_WORKERS = int(getenv("PLEXTIME_WORKERS") or "1")
+PLEXTIME_WORKERS_POLL_INTERVAL = 5
+PLEXTIME_WORKERS_MAX_RESTART_BACKOFF = 300
+PLEXTIME_PROFILING = getenv("PLEXTIME_PROFILING", "false") == "true"
+PLEXTIME_PROFILING_SAMPLE_RATE = float(getenv("PLEXTIME_PROFILING_SAMPLE_RATE") or "0.1")
+PLEXTIME_PROFILING_MAX_FILES = int(getenv("PLEXTIME_PROFILING_MAX_FILES") or "100")
+PLEXTIME_PROFILING_DIR = "./logs/profiles"
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from json import load
+from pathlib import Path
+from typing import List, Optional
+
+from dataclass_wizard import fromlist
+
+from plextime_bot.config.constants import (
+    PLEXTIME_CHECKIN_JOURNAL_OPTION,
+    PLEXTIME_CHECKIN_RANDOM_MARGIN,
+    PLEXTIME_CHECKOUT_JOURNAL_OPTION,
+    PLEXTIME_CHECKOUT_RANDOM_MARGIN,
+    PLEXTIME_ORIGIN,
+    PLEXTIME_PASSWORD,
+    PLEXTIME_PREWARM_LEAD_TIME,
+    PLEXTIME_TELEGRAM_BOT_TOKEN,
+    PLEXTIME_TELEGRAM_CHANNEL_ID,
+    PLEXTIME_TELEGRAM_NOTIFICATIONS,
+    PLEXTIME_TENANTS_FILE,
+    PLEXTIME_TIMEZONE,
+    PLEXTIME_USER,
+)
+
+
+@dataclass(frozen=True)
+class TenantSettings:
+    user: Optional[str] = PLEXTIME_USER
+    password: Optional[str] = PLEXTIME_PASSWORD
+    timezone: str = PLEXTIME_TIMEZONE
+    checkin_journal_option: int = int(PLEXTIME_CHECKIN_JOURNAL_OPTION)
+    checkout_journal_option: int = int(PLEXTIME_CHECKOUT_JOURNAL_OPTION)
+    origin: int = PLEXTIME_ORIGIN
+    checkin_random_margin: int = PLEXTIME_CHECKIN_RANDOM_MARGIN
+    checkout_random_margin: int = PLEXTIME_CHECKOUT_RANDOM_MARGIN
+    prewarm_lead_time: int = PLEXTIME_PREWARM_LEAD_TIME
+    telegram_notifications: bool = PLEXTIME_TELEGRAM_NOTIFICATIONS
+    telegram_bot_token: Optional[str] = PLEXTIME_TELEGRAM_BOT_TOKEN
+    telegram_channel_id: Optional[str] = PLEXTIME_TELEGRAM_CHANNEL_ID
+
+
+def load_tenant_settings(tenants_file: Optional[str] = PLEXTIME_TENANTS_FILE) -> List[TenantSettings]:
+    if not tenants_file:
+        return [TenantSettings()]
+
+    with Path(tenants_file).open(encoding="utf-8") as file:
+        tenants: List[TenantSettings] = fromlist(TenantSettings, load(file))
+
+    return tenants
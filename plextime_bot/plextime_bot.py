@@ -1,10 +1,14 @@
+from datetime import date, datetime, time, timedelta
 from enum import Enum
 from random import randint
+from threading import Event, Lock
 from time import sleep
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 from art import text2art
-from schedule import clear, every, get_jobs, idle_seconds, run_pending
+from pytz import UnknownTimeZoneError, timezone
+from requests import Session
+from schedule import Scheduler
 
 from plextime_bot.config.constants import (
     APP_NAME,
@@ -13,20 +17,14 @@ from plextime_bot.config.constants import (
     PLEXTIME_API_URL,
     PLEXTIME_BOT_REFRESH_HOUR,
     PLEXTIME_CHECKIN_MESSAGE,
-    PLEXTIME_CHECKIN_RANDOM_MARGIN,
     PLEXTIME_CHECKOUT_MESSAGE,
-    PLEXTIME_CHECKOUT_RANDOM_MARGIN,
-    PLEXTIME_PASSWORD,
-    PLEXTIME_TELEGRAM_BOT_TOKEN,
-    PLEXTIME_TELEGRAM_CHANNEL_ID,
-    PLEXTIME_TELEGRAM_NOTIFICATIONS,
-    PLEXTIME_TIMEZONE,
-    PLEXTIME_USER,
 )
+from plextime_bot.config.settings import TenantSettings
 from plextime_bot.services.plextime_api_client import PlextimeApiClient, PlextimeApiClientError, Timetable
 from plextime_bot.services.telegram_notificator import TelegramNotificator
-from plextime_bot.utils.date_manager import current_local_datetime_human_readable
+from plextime_bot.utils.date_manager import current_datetime_human_readable_in, current_utc_datetime
 from plextime_bot.utils.logger import Logger
+from plextime_bot.utils.profiler import profiled_job, profiled_tenant
 
 LOGGER = Logger.get_logger("plextime_bot")
 
@@ -44,18 +42,43 @@ class PlextimeBotError(Exception):
 
 
 class PlextimeBot:
-    def __init__(self) -> None:
-        self.__validate_required_env_vars()
-        self.__plextime_api_client = PlextimeApiClient(PLEXTIME_API_URL, PLEXTIME_USER, PLEXTIME_PASSWORD)  # type: ignore[arg-type]
+    def __init__(
+        self,
+        settings: Optional[TenantSettings] = None,
+        api_url: str = PLEXTIME_API_URL,
+        session: Optional[Session] = None,
+        scheduler: Optional[Scheduler] = None,
+        sleep_function: Optional[Callable[[float], None]] = None,
+    ) -> None:
+        self.__settings = settings or TenantSettings()
+        self.__validate_settings(self.__settings)
+        self.__plextime_api_client = PlextimeApiClient(
+            api_url,
+            self.__settings.user,  # type: ignore[arg-type]
+            self.__settings.password,  # type: ignore[arg-type]
+            self.__settings.checkin_journal_option,
+            self.__settings.checkout_journal_option,
+            self.__settings.origin,
+            self.__settings.timezone,
+            session,
+        )
         self.__telegram_notificator = self.__get_telegram_notificator_if_enabled()
+        self.__scheduler = scheduler or Scheduler()
+        self.__sleep = sleep_function or sleep
+        self.__interruptible_idle = sleep_function is None
+        self.__wakeup = Event()
+        self.__stopped = Event()
+        self.__pending_settings: Optional[TenantSettings] = None
+        self.__pending_settings_lock = Lock()
         self.__current_timetable: Optional[Timetable] = None
 
-    def __validate_required_env_vars(self) -> None:
-        if not PLEXTIME_USER or not PLEXTIME_PASSWORD:
+    @staticmethod
+    def __validate_settings(settings: TenantSettings) -> None:
+        if not settings.user or not settings.password:
             LOGGER.error("🚨 'PLEXTIME_USER' and 'PLEXTIME_PASSWORD' environment variables are mandatory")
             raise PlextimeBotError("'PLEXTIME_USER' and 'PLEXTIME_PASSWORD' environment variables are mandatory")
 
-        if PLEXTIME_TELEGRAM_NOTIFICATIONS and (not PLEXTIME_TELEGRAM_BOT_TOKEN or not PLEXTIME_TELEGRAM_CHANNEL_ID):
+        if settings.telegram_notifications and (not settings.telegram_bot_token or not settings.telegram_channel_id):
             LOGGER.error(
                 "🚨 'PLEXTIME_TELEGRAM_BOT_TOKEN' and 'PLEXTIME_TELEGRAM_CHANNEL_ID' environment variables are"
                 " mandatory",
@@ -64,21 +87,140 @@ class PlextimeBot:
                 "'PLEXTIME_TELEGRAM_BOT_TOKEN' and 'PLEXTIME_TELEGRAM_CHANNEL_ID' environment variables are mandatory",
             )
 
+        try:
+            timezone(settings.timezone)
+        except UnknownTimeZoneError as e:
+            LOGGER.error("🚨 '%s' is not a valid timezone", settings.timezone)
+            raise PlextimeBotError(f"'{settings.timezone}' is not a valid timezone") from e
+
     def __get_telegram_notificator_if_enabled(self) -> Optional[TelegramNotificator]:
-        if PLEXTIME_TELEGRAM_NOTIFICATIONS:
-            return TelegramNotificator(PLEXTIME_TELEGRAM_BOT_TOKEN, PLEXTIME_TELEGRAM_CHANNEL_ID)  # type: ignore[arg-type]
+        if self.__settings.telegram_notifications:
+            return TelegramNotificator(
+                self.__settings.telegram_bot_token,  # type: ignore[arg-type]
+                self.__settings.telegram_channel_id,  # type: ignore[arg-type]
+            )
         return None
 
     def __sleep_random_time(self, min_val: int, max_val: int) -> None:
-        sleep(randint(min_val, max_val))
+        self.__sleep(randint(min_val, max_val))
+
+    def __idle(self, seconds: float) -> None:
+        if self.__interruptible_idle:
+            self.__wakeup.wait(seconds)
+        else:
+            self.__sleep(seconds)
+
+    def update_settings(self, settings: TenantSettings) -> None:
+        self.__validate_settings(settings)
+        with self.__pending_settings_lock:
+            self.__pending_settings = settings
+        self.__wakeup.set()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__wakeup.set()
+
+    def __apply_pending_settings(self) -> None:
+        self.__wakeup.clear()
+        with self.__pending_settings_lock:
+            settings, self.__pending_settings = self.__pending_settings, None
+
+        if settings is None or settings == self.__settings:
+            return
+
+        previous_settings = self.__settings
+
+        try:
+            self.__apply_settings(settings, previous_settings)
+        except Exception:
+            LOGGER.exception("🚨 Settings for 👤 %s could not be applied, keeping the previous ones", settings.user)
+            try:
+                self.__apply_settings(previous_settings, settings)
+            except Exception:
+                LOGGER.exception("🚨 Previous settings for 👤 %s could not be restored", settings.user)
+            return
+
+        LOGGER.info("⚙️ Settings for 👤 %s have been updated", settings.user)
+
+    def __apply_settings(self, settings: TenantSettings, previous_settings: TenantSettings) -> None:
+        self.__settings = settings
+
+        self.__plextime_api_client.reconfigure(
+            settings.password,  # type: ignore[arg-type]
+            settings.checkin_journal_option,
+            settings.checkout_journal_option,
+            settings.origin,
+            settings.timezone,
+        )
+
+        if (
+            settings.telegram_notifications,
+            settings.telegram_bot_token,
+            settings.telegram_channel_id,
+        ) != (
+            previous_settings.telegram_notifications,
+            previous_settings.telegram_bot_token,
+            previous_settings.telegram_channel_id,
+        ):
+            self.__telegram_notificator = self.__get_telegram_notificator_if_enabled()
+
+        if (settings.timezone, settings.prewarm_lead_time) != (
+            previous_settings.timezone,
+            previous_settings.prewarm_lead_time,
+        ):
+            self.__schedule_refresh()
+            if self.__current_timetable:
+                self.__schedule_timetable_checks(self.__current_timetable)
+
+    def __wait_until(self, target: datetime) -> None:
+        self.__sleep(max((target - current_utc_datetime()).total_seconds(), 0))
+
+    def __prewarm(self, planned_datetime: datetime) -> datetime:
+        if planned_datetime > current_utc_datetime():
+            self.__prewarm_client()
+            self.__wait_until(planned_datetime)
+
+        return planned_datetime
+
+    def __planned_datetime(self) -> datetime:
+        return current_utc_datetime() + timedelta(seconds=self.__settings.prewarm_lead_time)
+
+    @profiled_job("prewarm", leading=True)
+    def __prewarm_client(self) -> None:
+        try:
+            self.__plextime_api_client.prewarm()
+        except PlextimeApiClientError as e:
+            LOGGER.warning("⚠️ Pre-warm failed so the check will run from scratch: %s", e)
+
+    def __record_write_delay(self, planned_datetime: Optional[datetime]) -> None:
+        check_datetime = self.__plextime_api_client.last_check_datetime
+
+        if planned_datetime is None or check_datetime is None:
+            return
+
+        LOGGER.info(
+            "🎯 Check written %.3f s after its planned time",
+            (check_datetime - planned_datetime).total_seconds(),
+        )
 
     def _random_checkin(self) -> None:
+        # Jitter and lead waits stay out of the profiled jobs so sampling never spans them
+        self.__sleep_random_time(0, self.__settings.checkin_random_margin)
+        self.__checkin(self.__prewarm(self.__planned_datetime()))
+
+    @profiled_job("checkin")
+    def __checkin(self, planned_datetime: Optional[datetime] = None, first_check_only: bool = False) -> None:
         try:
-            self.__sleep_random_time(0, PLEXTIME_CHECKIN_RANDOM_MARGIN)
-            if self.__plextime_api_client.checkin_if_working_day_and_not_checkedin_before():
+            checked_in = (
+                self.__plextime_api_client.checkin_if_working_day_and_not_checked_today()
+                if first_check_only
+                else self.__plextime_api_client.checkin_if_working_day_and_not_checkedin_before()
+            )
+            if checked_in:
+                self.__record_write_delay(planned_datetime)
                 self.__log_and_send_notification_if_enabled(
                     PLEXTIME_CHECKIN_MESSAGE.format(
-                        checkin_datetime=current_local_datetime_human_readable(),
+                        checkin_datetime=current_datetime_human_readable_in(self.__settings.timezone),
                     ),
                 )
         except PlextimeApiClientError as e:
@@ -88,15 +230,20 @@ class PlextimeBot:
             )
 
     def _random_checkout(self) -> None:
+        self.__sleep_random_time(
+            self.__settings.checkin_random_margin,
+            max(self.__settings.checkout_random_margin, self.__settings.checkin_random_margin),
+        )
+        self.__checkout(self.__prewarm(self.__planned_datetime()))
+
+    @profiled_job("checkout")
+    def __checkout(self, planned_datetime: Optional[datetime] = None) -> None:
         try:
-            self.__sleep_random_time(
-                PLEXTIME_CHECKIN_RANDOM_MARGIN,
-                max(PLEXTIME_CHECKOUT_RANDOM_MARGIN, PLEXTIME_CHECKIN_RANDOM_MARGIN),
-            )
             if self.__plextime_api_client.checkout_if_checkedin_before():
+                self.__record_write_delay(planned_datetime)
                 self.__log_and_send_notification_if_enabled(
                     PLEXTIME_CHECKOUT_MESSAGE.format(
-                        checkout_datetime=current_local_datetime_human_readable(),
+                        checkout_datetime=current_datetime_human_readable_in(self.__settings.timezone),
                     ),
                 )
         except PlextimeApiClientError as e:
@@ -110,6 +257,7 @@ class PlextimeBot:
         if self.__telegram_notificator:
             self.__telegram_notificator.send_notification(message)
 
+    @profiled_job("schedule_checks")
     def __schedule_checks(self) -> None:
         try:
             LOGGER.info("🔂 Scheduling checks")
@@ -133,31 +281,7 @@ class PlextimeBot:
                     )
 
                 self.__current_timetable = new_timetable
-
-                if get_jobs(TaskType.CHECK):
-                    LOGGER.info("🧹 Cleaning up old schedulings")
-                    clear(TaskType.CHECK)
-
-                self.__log_and_send_notification_if_enabled(
-                    "📅 Scheduled check-ins and check-outs based on timetable"
-                    f" {new_timetable.name} ({new_timetable.description})",
-                )
-
-                sorted_timetable_entries = sorted(new_timetable.entries, key=lambda e: e.week_day)
-
-                for entry in sorted_timetable_entries:
-                    day_name = DAY_NAMES[entry.week_day]
-                    getattr(every(), day_name).at(entry.hour_in, PLEXTIME_TIMEZONE).do(self._random_checkin).tag(
-                        TaskType.CHECK,
-                        TaskType.CHECK_IN,
-                    )
-                    getattr(every(), day_name).at(entry.hour_out, PLEXTIME_TIMEZONE).do(self._random_checkout).tag(
-                        TaskType.CHECK,
-                        TaskType.CHECK_OUT,
-                    )
-                    self.__log_and_send_notification_if_enabled(
-                        f"⏰ {day_name.capitalize()}: ➡️ Check-in - {entry.hour_in} | ⬅️ Check-out - {entry.hour_out}",
-                    )
+                self.__schedule_timetable_checks(new_timetable)
             else:
                 LOGGER.info("💭 No timetable change detected so it is not necessary to reschedule checks")
         except PlextimeApiClientError as e:
@@ -166,13 +290,95 @@ class PlextimeBot:
                 is_error=True,
             )
 
-    def start(self) -> None:
-        LOGGER.info("Hi! I'm %s. Nice to meet you! 🫡\n\n%s", AUTHOR, text2art(APP_NAME))
+    def __schedule_timetable_checks(self, new_timetable: Timetable) -> None:
+        if self.__scheduler.get_jobs(TaskType.CHECK):
+            LOGGER.info("🧹 Cleaning up old schedulings")
+            self.__scheduler.clear(TaskType.CHECK)
+
         self.__log_and_send_notification_if_enabled(
-            f"🤖 Plextime Bot is configured to check in and out on behalf of 👤 {PLEXTIME_USER}",
+            "📅 Scheduled check-ins and check-outs based on timetable"
+            f" {new_timetable.name} ({new_timetable.description})",
+        )
+
+        sorted_timetable_entries = sorted(new_timetable.entries, key=lambda e: e.week_day)
+
+        for entry in sorted_timetable_entries:
+            day_name = DAY_NAMES[entry.week_day]
+            checkin_day_name, checkin_time = self.__ahead_of_check(entry.week_day, entry.hour_in)
+            checkout_day_name, checkout_time = self.__ahead_of_check(entry.week_day, entry.hour_out)
+            getattr(self.__scheduler.every(), checkin_day_name).at(checkin_time, self.__settings.timezone).do(
+                self._random_checkin,
+            ).tag(
+                TaskType.CHECK,
+                TaskType.CHECK_IN,
+            )
+            getattr(self.__scheduler.every(), checkout_day_name).at(checkout_time, self.__settings.timezone).do(
+                self._random_checkout,
+            ).tag(
+                TaskType.CHECK,
+                TaskType.CHECK_OUT,
+            )
+            self.__log_and_send_notification_if_enabled(
+                f"⏰ {day_name.capitalize()}: ➡️ Check-in - {entry.hour_in} | ⬅️ Check-out - {entry.hour_out}",
+            )
+
+    def __ahead_of_check(self, week_day: int, hour: str) -> Tuple[str, str]:
+        # Checks are scheduled ahead of time by the pre-warm lead time, which may move them to the previous day
+        check_time = time.fromisoformat(hour)
+        moment = datetime.combine(date(2001, 1, week_day), check_time) - timedelta(
+            seconds=self.__settings.prewarm_lead_time,
         )
+        return DAY_NAMES[moment.isoweekday()], moment.strftime("%H:%M:%S")
+
+    def __recover_missed_checks(self) -> None:
+        if not self.__current_timetable:
+            return
+
+        tenant_timezone = timezone(self.__settings.timezone)
+        now = current_utc_datetime().astimezone(tenant_timezone)
+        lead_time = timedelta(seconds=self.__settings.prewarm_lead_time)
+        checks: List[Tuple[datetime, TaskType]] = []
+
+        # Tomorrow is included because its first check may be due today once shifted by the lead time
+        for day in (now.date(), now.date() + timedelta(days=1)):
+            entry = next((e for e in self.__current_timetable.entries if e.week_day == day.isoweekday()), None)
 
-        every().day.at(PLEXTIME_BOT_REFRESH_HOUR, PLEXTIME_TIMEZONE).do(
+            if entry is not None:
+                checks.append(
+                    (
+                        tenant_timezone.localize(datetime.combine(day, time.fromisoformat(entry.hour_in))),
+                        TaskType.CHECK_IN,
+                    ),
+                )
+                checks.append(
+                    (
+                        tenant_timezone.localize(datetime.combine(day, time.fromisoformat(entry.hour_out))),
+                        TaskType.CHECK_OUT,
+                    ),
+                )
+
+        # Scheduled jobs fire ahead of every check, so the last check whose job should have fired is the missed one
+        due_checks = [(check_datetime, check) for check_datetime, check in checks if check_datetime - lead_time <= now]
+
+        if not due_checks:
+            return
+
+        LOGGER.info("🩹 Recovering checks that could have been missed while the bot was down")
+
+        check_datetime, task_type = max(due_checks, key=lambda c: c[0])
+        planned_datetime = self.__prewarm(check_datetime) if check_datetime > now else None
+
+        if task_type == TaskType.CHECK_OUT:
+            self.__checkout(planned_datetime)
+            return
+
+        # Once its window is over, a check-in is only recovered if nothing was recorded, as the user may have left
+        checkin_window_ends = check_datetime + timedelta(seconds=self.__settings.checkin_random_margin)
+        self.__checkin(planned_datetime, first_check_only=now > checkin_window_ends)
+
+    def __schedule_refresh(self) -> None:
+        self.__scheduler.clear(TaskType.SCHEDULE)
+        self.__scheduler.every().day.at(PLEXTIME_BOT_REFRESH_HOUR, self.__settings.timezone).do(
             self.__schedule_checks,
         ).tag(
             TaskType.SCHEDULE,
@@ -181,15 +387,37 @@ class PlextimeBot:
             f"🔄 Timetable update task is set for every day at {PLEXTIME_BOT_REFRESH_HOUR}",
         )
 
-        self.__schedule_checks()
+    def start(self, run_until: Optional[datetime] = None, recover_missed_checks: bool = False) -> None:
+        LOGGER.info("Hi! I'm %s. Nice to meet you! 🫡\n\n%s", AUTHOR, text2art(APP_NAME))
+        self.__log_and_send_notification_if_enabled(
+            f"🤖 Plextime Bot is configured to check in and out on behalf of 👤 {self.__settings.user}",
+        )
+
+        with profiled_tenant(self.__settings.user):
+            self.__schedule_refresh()
+            self.__schedule_checks()
 
-        while True:
-            seconds_until_next_job = idle_seconds()
+            if recover_missed_checks:
+                self.__recover_missed_checks()
 
-            if seconds_until_next_job is None:
-                break
+        self.run(run_until)
+
+    def run(self, run_until: Optional[datetime] = None) -> None:
+        with profiled_tenant(self.__settings.user):
+            while not self.__stopped.is_set() and (run_until is None or current_utc_datetime() < run_until):
+                self.__apply_pending_settings()
+                seconds_until_next_job = self.__scheduler.idle_seconds
+
+                if seconds_until_next_job is None:
+                    break
+
+                if run_until is not None:
+                    seconds_until_next_job = min(
+                        seconds_until_next_job,
+                        (run_until - current_utc_datetime()).total_seconds(),
+                    )
 
-            if seconds_until_next_job > 0:
-                sleep(seconds_until_next_job)
+                if seconds_until_next_job > 0:
+                    self.__idle(seconds_until_next_job)
 
-            run_pending()
+                self.__scheduler.run_pending()
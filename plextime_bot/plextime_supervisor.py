@@ -0,0 +1,347 @@
+import signal
+from enum import Enum
+from multiprocessing import Process, Queue
+from pathlib import Path
+from queue import Empty
+from threading import Thread
+from time import sleep
+from types import FrameType
+from typing import Callable, Dict, List, Optional, Tuple
+
+from plextime_bot.config.constants import PLEXTIME_WORKERS_MAX_RESTART_BACKOFF, PLEXTIME_WORKERS_POLL_INTERVAL
+from plextime_bot.config.settings import TenantSettings, load_tenant_settings
+from plextime_bot.plextime_bot import PlextimeBot, PlextimeBotError
+from plextime_bot.utils.hash_ring import HashRing
+from plextime_bot.utils.logger import Logger
+from plextime_bot.utils.restart_backoff import RestartBackoff
+
+LOGGER = Logger.get_logger("plextime_supervisor")
+
+
+class WorkerCommand(Enum):
+    ADD_TENANT = 0
+    REMOVE_TENANT = 1
+    UPDATE_TENANT = 2
+
+
+WorkerMessage = Tuple[WorkerCommand, TenantSettings]
+WorkerTarget = Callable[[str, List[TenantSettings], "Queue[WorkerMessage]", bool], None]
+
+
+class PlextimeWorker:
+    def __init__(
+        self,
+        worker_id: str,
+        tenants: List[TenantSettings],
+        commands: "Optional[Queue[WorkerMessage]]" = None,
+        recover_missed_checks: bool = False,
+    ) -> None:
+        self.__worker_id = worker_id
+        self.__tenants = tenants
+        self.__commands = commands
+        self.__recover_missed_checks = recover_missed_checks
+        self.__bots: Dict[str, Tuple[PlextimeBot, Thread]] = {}
+        self.__tenant_settings: Dict[str, TenantSettings] = {}
+        self.__restart_backoff = RestartBackoff(PLEXTIME_WORKERS_POLL_INTERVAL, PLEXTIME_WORKERS_MAX_RESTART_BACKOFF)
+
+    def start(self) -> None:
+        LOGGER.info("👷 Worker %s is taking care of %s tenants", self.__worker_id, len(self.__tenants))
+
+        for settings in self.__tenants:
+            self.__add_tenant(settings, self.__recover_missed_checks)
+
+        while True:
+            self.__process_commands()
+            self.__restart_dead_bots()
+
+    def __process_commands(self) -> None:
+        if self.__commands is None:
+            sleep(PLEXTIME_WORKERS_POLL_INTERVAL)
+            return
+
+        try:
+            command, settings = self.__commands.get(timeout=PLEXTIME_WORKERS_POLL_INTERVAL)
+        except Empty:
+            return
+
+        if command == WorkerCommand.ADD_TENANT:
+            self.__add_tenant(settings, recover_missed_checks=True)
+        elif command == WorkerCommand.REMOVE_TENANT:
+            self.__remove_tenant(settings)
+        elif command == WorkerCommand.UPDATE_TENANT:
+            self.__update_tenant(settings)
+
+    def __restart_dead_bots(self) -> None:
+        # A crashed bot only takes its own tenant down, the rest of the shard keeps running untouched
+        for user, (_, thread) in list(self.__bots.items()):
+            if not thread.is_alive():
+                del self.__bots[user]
+                backoff = self.__restart_backoff.failed(user)
+                LOGGER.error(
+                    "🚨 Bot for 👤 %s stopped in worker %s, restarting it in %s seconds",
+                    user,
+                    self.__worker_id,
+                    backoff,
+                )
+
+        for user in self.__restart_backoff.pop_due():
+            if user in self.__tenant_settings and user not in self.__bots:
+                self.__add_tenant(self.__tenant_settings[user], recover_missed_checks=True)
+
+    def __add_tenant(self, settings: TenantSettings, recover_missed_checks: bool) -> None:
+        user = str(settings.user)
+
+        if user in self.__bots:
+            self.__update_tenant(settings)
+            return
+
+        self.__tenant_settings[user] = settings
+
+        if self.__restart_backoff.is_pending(user):
+            return
+
+        try:
+            bot = PlextimeBot(settings)
+        except PlextimeBotError as e:
+            LOGGER.error("🚨 Tenant 👤 %s cannot be started: %s", settings.user, e)
+            return
+
+        thread = Thread(
+            target=self.__run_bot,
+            args=(bot, settings, recover_missed_checks),
+            name=f"{self.__worker_id}-{settings.user}",
+            daemon=True,
+        )
+        self.__bots[user] = (bot, thread)
+        self.__restart_backoff.started(user)
+        thread.start()
+
+    def __remove_tenant(self, settings: TenantSettings) -> None:
+        user = str(settings.user)
+        bot_and_thread = self.__bots.pop(user, None)
+        self.__tenant_settings.pop(user, None)
+        self.__restart_backoff.forget(user)
+
+        if bot_and_thread is None:
+            return
+
+        # The thread finishes on its own once any check that is already running completes
+        bot_and_thread[0].stop()
+        LOGGER.info("👋 Tenant 👤 %s has been removed from worker %s", settings.user, self.__worker_id)
+
+    def __update_tenant(self, settings: TenantSettings) -> None:
+        bot_and_thread = self.__bots.get(str(settings.user))
+
+        if bot_and_thread is None:
+            self.__add_tenant(settings, recover_missed_checks=True)
+            return
+
+        try:
+            bot_and_thread[0].update_settings(settings)
+        except PlextimeBotError as e:
+            LOGGER.error("🚨 New settings for tenant 👤 %s have been discarded: %s", settings.user, e)
+            return
+
+        self.__tenant_settings[str(settings.user)] = settings
+
+    def __run_bot(self, bot: PlextimeBot, settings: TenantSettings, recover_missed_checks: bool) -> None:
+        try:
+            bot.start(recover_missed_checks=recover_missed_checks)
+        except Exception:
+            LOGGER.exception("🚨 Bot for 👤 %s crashed in worker %s", settings.user, self.__worker_id)
+
+
+def start_plextime_worker(
+    worker_id: str,
+    tenants: List[TenantSettings],
+    commands: "Queue[WorkerMessage]",
+    recover_missed_checks: bool,
+) -> None:
+    PlextimeWorker(worker_id, tenants, commands, recover_missed_checks).start()
+
+
+class PlextimeSupervisor:
+    def __init__(
+        self,
+        tenants_file: Optional[str],
+        workers: int,
+        worker_target: WorkerTarget = start_plextime_worker,
+    ) -> None:
+        self.__tenants_file = Path(tenants_file) if tenants_file else None
+        self.__tenants_file_mtime = self.__get_tenants_file_mtime()
+        self.__tenants = {str(t.user): t for t in load_tenant_settings(tenants_file)}
+        self.__hash_ring = HashRing(f"worker-{index}" for index in range(max(workers, 1)))
+        self.__shards: Dict[str, List[str]] = {}
+        self.__processes: Dict[str, Tuple[Process, Queue[WorkerMessage]]] = {}
+        self.__requested_workers = len(self.__hash_ring.nodes)
+        self.__restart_backoff = RestartBackoff(PLEXTIME_WORKERS_POLL_INTERVAL, PLEXTIME_WORKERS_MAX_RESTART_BACKOFF)
+        self.__worker_target = worker_target
+
+    def start(self) -> None:
+        self.launch()
+
+        # Workers can only be added or removed through signals on POSIX systems
+        if hasattr(signal, "SIGUSR1") and hasattr(signal, "SIGUSR2"):
+            signal.signal(signal.SIGUSR1, self.__request_worker_addition)
+            signal.signal(signal.SIGUSR2, self.__request_worker_removal)
+
+        while True:
+            sleep(PLEXTIME_WORKERS_POLL_INTERVAL)
+            self.poll()
+
+    def launch(self) -> None:
+        LOGGER.info(
+            "🧭 Supervising %s tenants across %s workers",
+            len(self.__tenants),
+            len(self.__hash_ring.nodes),
+        )
+
+        self.__rebalance(recover_missed_checks=False)
+
+    def poll(self) -> None:
+        self.__resize_workers_if_requested()
+        self.__reload_tenants_if_changed()
+        self.__restart_dead_workers()
+
+    def join(self) -> None:
+        for process, _ in list(self.__processes.values()):
+            process.join()
+
+    def add_worker(self, worker_id: str) -> None:
+        self.__hash_ring.add_node(worker_id)
+        self.__rebalance()
+
+    def remove_worker(self, worker_id: str) -> None:
+        self.__hash_ring.remove_node(worker_id)
+        self.__rebalance()
+
+    def __request_worker_addition(self, _signum: int, _frame: Optional[FrameType]) -> None:
+        self.__requested_workers += 1
+
+    def __request_worker_removal(self, _signum: int, _frame: Optional[FrameType]) -> None:
+        self.__requested_workers = max(self.__requested_workers - 1, 1)
+
+    def __resize_workers_if_requested(self) -> None:
+        # Signal handlers only record the request, so the ring is always resized from the main loop
+        while len(self.__hash_ring.nodes) < self.__requested_workers:
+            worker_id = f"worker-{len(self.__hash_ring.nodes)}"
+            LOGGER.info("🆕 Adding worker %s", worker_id)
+            self.add_worker(worker_id)
+
+        while len(self.__hash_ring.nodes) > self.__requested_workers:
+            worker_id = self.__hash_ring.nodes[-1]
+            LOGGER.info("👋 Removing worker %s", worker_id)
+            self.remove_worker(worker_id)
+
+    def __get_tenants_file_mtime(self) -> Optional[float]:
+        try:
+            return self.__tenants_file.stat().st_mtime if self.__tenants_file else None
+        except OSError:
+            return None
+
+    def __reload_tenants_if_changed(self) -> None:
+        tenants_file_mtime = self.__get_tenants_file_mtime()
+
+        if tenants_file_mtime is None or tenants_file_mtime == self.__tenants_file_mtime:
+            return
+
+        self.__tenants_file_mtime = tenants_file_mtime
+
+        try:
+            tenants = {str(t.user): t for t in load_tenant_settings(str(self.__tenants_file))}
+        except Exception:
+            LOGGER.exception("🚨 Tenants file %s could not be loaded, keeping the current tenants", self.__tenants_file)
+            return
+
+        LOGGER.info("🔁 Tenants file %s has changed, applying the new settings", self.__tenants_file)
+
+        previous_tenants, self.__tenants = self.__tenants, tenants
+        self.__shards = self.__hash_ring.distribute(sorted(tenants))
+
+        for user in previous_tenants.keys() - tenants.keys():
+            self.__send_command(user, WorkerCommand.REMOVE_TENANT, previous_tenants[user])
+
+        for user in tenants.keys() - previous_tenants.keys():
+            self.__send_command(user, WorkerCommand.ADD_TENANT, tenants[user])
+
+        for user in tenants.keys() & previous_tenants.keys():
+            if tenants[user] != previous_tenants[user]:
+                self.__send_command(user, WorkerCommand.UPDATE_TENANT, tenants[user])
+
+    def __send_command(self, user: str, command: WorkerCommand, settings: TenantSettings) -> None:
+        worker_id = self.__hash_ring.get_node(user)
+
+        if worker_id in self.__processes:
+            self.__processes[worker_id][1].put((command, settings))
+        elif command != WorkerCommand.REMOVE_TENANT and not self.__restart_backoff.is_pending(worker_id):
+            self.__start_worker(worker_id, recover_missed_checks=True)
+
+    def __rebalance(self, recover_missed_checks: bool = True) -> None:
+        previous_owners = {user: worker_id for worker_id, users in self.__shards.items() for user in users}
+        self.__shards = self.__hash_ring.distribute(sorted(self.__tenants))
+        owners = {user: worker_id for worker_id, users in self.__shards.items() for user in users}
+        moved_users = [user for user, worker_id in owners.items() if previous_owners.get(user) != worker_id]
+
+        for worker_id in list(self.__processes):
+            if worker_id not in self.__shards:
+                self.__stop_worker(worker_id)
+
+        # Moved tenants are handed over with commands so the workers keeping their shard are never restarted
+        for user in moved_users:
+            previous_worker_id = previous_owners.get(user)
+            if previous_worker_id in self.__processes:
+                self.__processes[previous_worker_id][1].put((WorkerCommand.REMOVE_TENANT, self.__tenants[user]))
+
+        running_workers = set(self.__processes)
+
+        for worker_id in self.__shards:
+            if worker_id not in self.__processes and not self.__restart_backoff.is_pending(worker_id):
+                self.__start_worker(worker_id, recover_missed_checks)
+
+        for user in moved_users:
+            if owners[user] in running_workers:
+                self.__processes[owners[user]][1].put((WorkerCommand.ADD_TENANT, self.__tenants[user]))
+
+        if previous_owners:
+            LOGGER.info("⚖️ %s tenants moved across %s workers", len(moved_users), len(self.__shards))
+
+    def __restart_dead_workers(self) -> None:
+        for worker_id, (process, _) in list(self.__processes.items()):
+            if process.is_alive():
+                continue
+
+            del self.__processes[worker_id]
+            backoff = self.__restart_backoff.failed(worker_id)
+            LOGGER.error(
+                "🚨 Worker %s exited with code %s, restarting it in %s seconds",
+                worker_id,
+                process.exitcode,
+                backoff,
+            )
+
+        for worker_id in self.__restart_backoff.pop_due():
+            if worker_id in self.__shards and worker_id not in self.__processes:
+                self.__start_worker(worker_id, recover_missed_checks=True)
+
+    def __start_worker(self, worker_id: str, recover_missed_checks: bool) -> None:
+        tenants = [self.__tenants[user] for user in self.__shards.get(worker_id, [])]
+
+        if not tenants:
+            LOGGER.info("💤 Worker %s has no tenants assigned", worker_id)
+            return
+
+        commands: Queue[WorkerMessage] = Queue()
+        process = Process(
+            target=self.__worker_target,
+            args=(worker_id, tenants, commands, recover_missed_checks),
+            name=worker_id,
+            daemon=True,
+        )
+        process.start()
+        self.__processes[worker_id] = (process, commands)
+        self.__restart_backoff.started(worker_id)
+
+    def __stop_worker(self, worker_id: str) -> None:
+        process, _ = self.__processes.pop(worker_id)
+        process.terminate()
+        process.join()
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import date, datetime
 from json import dumps
 from typing import Any, Callable, List, Optional, Union, cast
 
@@ -19,21 +20,26 @@ from plextime_bot.config.constants import (
     PLEXTIME_ORIGIN,
     PLEXTIME_TIMETABLE_PATH,
     PLEXTIME_TIMETABLES_PATH,
+    PLEXTIME_TIMEZONE,
     PLEXTIME_VACATIONS_PATH,
 )
 from plextime_bot.utils.aes_cipher import AESCipher
+from plextime_bot.utils.daily_cache import DailyCache
 from plextime_bot.utils.date_manager import (
-    current_local_date,
+    current_date_in,
     current_utc_datetime,
-    end_of_year_local,
-    start_of_year_local,
     to_string,
     with_utc_timezone,
 )
 from plextime_bot.utils.logger import Logger
+from plextime_bot.utils.profiler import profiled_phase
 
 LOGGER = Logger.get_logger("plextime_api_client")
 
+# Company-level data is read-only for the bot, so it is shared by every client living in the same process
+PUBLIC_HOLIDAYS_CACHE = DailyCache()
+TIMETABLES_CACHE = DailyCache()
+
 
 @dataclass
 class LoginData:
@@ -119,6 +125,13 @@ class CheckOutResult:
     result: str = json_field("result", all=True)
 
 
+@dataclass
+class PreparedDay:
+    day: date
+    is_non_working_day: bool
+    records: List[Record]
+
+
 class PlextimeApiClientError(Exception):
     def __init__(self, message: str = "An error ocurred in Plextime API Client") -> None:
         super().__init__(message)
@@ -133,6 +146,8 @@ class PlextimeApiClient:
         checkin_journal_option_id: Union[str, int] = PLEXTIME_CHECKIN_JOURNAL_OPTION,
         checkout_journal_option_id: Union[str, int] = PLEXTIME_CHECKOUT_JOURNAL_OPTION,
         origin: Union[str, int] = PLEXTIME_ORIGIN,
+        timezone: str = PLEXTIME_TIMEZONE,
+        session: Optional[Session] = None,
     ) -> None:
         self._base_url = base_url.rstrip("/")
         self._username = username
@@ -140,7 +155,8 @@ class PlextimeApiClient:
         self.__checkin_journal_option_id = int(checkin_journal_option_id)
         self.__checkout_journal_option_id = int(checkout_journal_option_id)
         self.__origin = origin
-        self.__session = Session()
+        self.__timezone = timezone
+        self.__session = session or Session()
         self.__headers = {
             "Content-Type": "application/json",
             "api-key": PLEXTIME_API_KEY,
@@ -149,6 +165,30 @@ class PlextimeApiClient:
         self.__user_id: Optional[int] = None
         self.__company_id: Optional[int] = None
         self.__locality_id: Optional[int] = None
+        self.__prepared_day: Optional[PreparedDay] = None
+        self.__last_check_datetime: Optional[datetime] = None
+
+    @property
+    def last_check_datetime(self) -> Optional[datetime]:
+        return self.__last_check_datetime
+
+    def reconfigure(
+        self,
+        password: str,
+        checkin_journal_option_id: Union[str, int],
+        checkout_journal_option_id: Union[str, int],
+        origin: Union[str, int],
+        timezone: str,
+    ) -> None:
+        self._password = password
+        self.__checkin_journal_option_id = int(checkin_journal_option_id)
+        self.__checkout_journal_option_id = int(checkout_journal_option_id)
+        self.__origin = origin
+        self.__timezone = timezone
+
+    def __today(self) -> date:
+        # Days are those of the tenant, which may not match the ones of the host
+        return current_date_in(self.__timezone)
 
     @staticmethod
     def __authenticated(method: Callable[..., Any]) -> Callable[..., Any]:
@@ -172,6 +212,7 @@ class PlextimeApiClient:
         return journal_options
 
     @__authenticated
+    @profiled_phase("calendar")
     def retrieve_current_timetable(self) -> Timetable:
         timetables_json = self.__get(
             PLEXTIME_TIMETABLES_PATH.format(company_id=self.__company_id, user_id=self.__user_id),
@@ -179,7 +220,7 @@ class PlextimeApiClient:
 
         timetables: List[TimetableSummary] = fromlist(TimetableSummary, timetables_json["timetable"])
 
-        today = current_local_date()
+        today = self.__today()
 
         fallback_timetable_id = next(
             (t.timetable_id for t in timetables if t.status and t.begins is None and t.ends is None),
@@ -195,40 +236,69 @@ class PlextimeApiClient:
             fallback_timetable_id,
         )
 
-        timetable_json = self.__get(
-            PLEXTIME_TIMETABLE_PATH.format(company_id=self.__company_id, timetable_id=active_timetable),
+        return TIMETABLES_CACHE.get_or_load(
+            (self.__company_id, active_timetable),
+            today,
+            lambda: fromdict(
+                Timetable,
+                self.__get(PLEXTIME_TIMETABLE_PATH.format(company_id=self.__company_id, timetable_id=active_timetable)),
+            ),
         )
 
-        return fromdict(Timetable, timetable_json)
-
     @__authenticated
+    def prewarm(self) -> None:
+        self.__prepared_day = self.__prepare_day()
+
     def checkin_if_working_day_and_not_checkedin_before(self) -> bool:
-        if self.__is_today_non_working_day():
-            return False
+        return self.__with_prepared_day(self.__checkin_if_not_checkedin_before)
 
-        current_day_info_json = self.__get(
-            PLEXTIME_DAY_INFO_PATH.format(
-                company_id=self.__company_id,
-                user_id=self.__user_id,
-                target_day=to_string(current_local_date()),
-            ),
+    def checkin_if_working_day_and_not_checked_today(self) -> bool:
+        return self.__with_prepared_day(self.__checkin_if_not_checked_today)
+
+    def checkout_if_checkedin_before(self) -> bool:
+        return self.__with_prepared_day(self.__checkout_if_checkedin_before)
+
+    def __with_prepared_day(self, check: Callable[[PreparedDay], bool]) -> bool:
+        prepared_day, self.__prepared_day = self.__prepared_day, None
+
+        if prepared_day is not None and prepared_day.day == self.__today():
+            try:
+                return check(prepared_day)
+            except PlextimeApiClientError:
+                LOGGER.warning("⚠️ Check with pre-warmed data failed, retrying it from scratch")
+
+        return check(self.__authenticated_prepare_day())
+
+    @__authenticated
+    def __authenticated_prepare_day(self) -> PreparedDay:
+        return self.__prepare_day()
+
+    def __prepare_day(self) -> PreparedDay:
+        today = self.__today()
+        return PreparedDay(
+            day=today,
+            is_non_working_day=self.__is_non_working_day(today),
+            records=self.__retrieve_day_records(today),
         )
 
-        current_day_records = fromlist(Record, current_day_info_json["checks"])
+    def __checkin_if_not_checkedin_before(self, prepared_day: PreparedDay) -> bool:
+        if prepared_day.is_non_working_day:
+            return False
 
-        has_record_without_checkout = any(r.checkout is None for r in current_day_records)
+        has_record_without_checkout = any(r.checkout is None for r in prepared_day.records)
 
         if has_record_without_checkout:
             return False
 
+        self.__last_check_datetime = current_utc_datetime()
         checkin_data = {
             "iduser": self.__user_id,
-            "date": to_string(current_utc_datetime()),
+            "date": to_string(self.__last_check_datetime),
             "optionId": self.__checkin_journal_option_id,
             "origin": self.__origin,
         }
 
-        checkin_json = self.__put(
+        checkin_json = self.__write_check(
             PLEXTIME_CHECKIN_PATH,
             checkin_data,
         )
@@ -237,22 +307,17 @@ class PlextimeApiClient:
 
         return checkin_result.result == "OK"
 
-    @__authenticated
-    def checkout_if_checkedin_before(self) -> bool:
-        if self.__is_today_non_working_day():
+    def __checkin_if_not_checked_today(self, prepared_day: PreparedDay) -> bool:
+        if prepared_day.records:
             return False
 
-        current_day_info_json = self.__get(
-            PLEXTIME_DAY_INFO_PATH.format(
-                company_id=self.__company_id,
-                user_id=self.__user_id,
-                target_day=to_string(current_local_date()),
-            ),
-        )
+        return self.__checkin_if_not_checkedin_before(prepared_day)
 
-        current_day_records = fromlist(Record, current_day_info_json["checks"])
+    def __checkout_if_checkedin_before(self, prepared_day: PreparedDay) -> bool:
+        if prepared_day.is_non_working_day:
+            return False
 
-        records_without_checkout = [r for r in current_day_records if r.checkout is None]
+        records_without_checkout = [r for r in prepared_day.records if r.checkout is None]
 
         last_record_without_checkout = (
             sorted(records_without_checkout, key=lambda r: r.checkin, reverse=True)[0]
@@ -263,15 +328,16 @@ class PlextimeApiClient:
         if last_record_without_checkout is None:
             return False
 
+        self.__last_check_datetime = current_utc_datetime()
         checkout_data = {
             "id": last_record_without_checkout.record_id,
             "iduser": self.__user_id,
-            "date": to_string(current_utc_datetime()),
+            "date": to_string(self.__last_check_datetime),
             "optionId": self.__checkout_journal_option_id,
             "origin": self.__origin,
         }
 
-        checkout_json = self.__put(
+        checkout_json = self.__write_check(
             PLEXTIME_CHECKOUT_PATH,
             checkout_data,
         )
@@ -280,35 +346,56 @@ class PlextimeApiClient:
 
         return checkout_result.result == "OK"
 
-    def __is_today_non_working_day(self) -> bool:
-        today = current_local_date()
-        public_hollidays = self.__retrieve_public_holidays_for_current_year()
-        user_hollidays = self.__retrieve_user_hollidays_for_current_year()
+    @profiled_phase("day_info")
+    def __retrieve_day_records(self, day: date) -> List[Record]:
+        current_day_info_json = self.__get(
+            PLEXTIME_DAY_INFO_PATH.format(
+                company_id=self.__company_id,
+                user_id=self.__user_id,
+                target_day=to_string(day),
+            ),
+        )
+
+        current_day_records: List[Record] = fromlist(Record, current_day_info_json["checks"])
+        return current_day_records
 
-        is_today_public_holliday = any(h.begins <= today <= h.ends for h in public_hollidays)
-        is_today_user_holliday = any(h.begins <= today <= h.ends for h in user_hollidays)
+    @profiled_phase("write")
+    def __write_check(self, endpoint: str, body: dict) -> Any:
+        return self.__put(endpoint, body)
 
-        return is_today_public_holliday or is_today_user_holliday
+    @profiled_phase("calendar")
+    def __is_non_working_day(self, day: date) -> bool:
+        public_hollidays = self.__retrieve_public_holidays_for_year_of(day)
+        user_hollidays = self.__retrieve_user_hollidays_for_year_of(day)
 
-    def __retrieve_public_holidays_for_current_year(self) -> List[PublicHoliday]:
-        holidays_json = self.__get(
-            PLEXTIME_HOLIDAYS_PATH.format(company_id=self.__company_id, locality_id=self.__locality_id),
+        is_public_holliday = any(h.begins <= day <= h.ends for h in public_hollidays)
+        is_user_holliday = any(h.begins <= day <= h.ends for h in user_hollidays)
+
+        return is_public_holliday or is_user_holliday
+
+    def __retrieve_public_holidays_for_year_of(self, day: date) -> List[PublicHoliday]:
+        return PUBLIC_HOLIDAYS_CACHE.get_or_load(
+            (self.__company_id, self.__locality_id),
+            day,
+            lambda: fromlist(
+                PublicHoliday,
+                self.__get(PLEXTIME_HOLIDAYS_PATH.format(company_id=self.__company_id, locality_id=self.__locality_id)),
+            ),
         )
-        holidays: List[PublicHoliday] = fromlist(PublicHoliday, holidays_json)
-        return holidays
 
-    def __retrieve_user_hollidays_for_current_year(self) -> List[Holiday]:
+    def __retrieve_user_hollidays_for_year_of(self, day: date) -> List[Holiday]:
         vacations_json = self.__get(
             PLEXTIME_VACATIONS_PATH.format(
                 company_id=self.__company_id,
                 user_id=self.__user_id,
-                date_from=to_string(start_of_year_local()),
-                date_to=to_string(end_of_year_local()),
+                date_from=to_string(date(day.year, 1, 1)),
+                date_to=to_string(date(day.year, 12, 31)),
             ),
         )
         vacations: List[Holiday] = fromlist(Holiday, vacations_json["requests"])
         return vacations
 
+    @profiled_phase("auth")
     def __retrieve_token_and_user_data(self) -> None:
         login_body = {"email": self._username, "password": self._password}
         login_data_json = self.__put(PLEXTIME_LOGIN_PATH, login_body)
@@ -1,6 +1,7 @@
 from requests import RequestException, Session
 
 from plextime_bot.utils.logger import Logger
+from plextime_bot.utils.profiler import profiled_phase
 
 LOGGER = Logger.get_logger("telegram_notificator")
 
@@ -15,6 +16,7 @@ class TelegramNotificator:
         self.channel_id = channel_id
         self.__session = Session()
 
+    @profiled_phase("notify")
     def send_notification(self, message: str) -> None:
         if self.token and self.channel_id:
             try:
@@ -0,0 +1,119 @@
+import logging
+import random
+from argparse import ArgumentParser, Namespace
+from typing import List, Optional
+
+from plextime_bot.config.constants import PLEXTIME_TIMEZONE
+from plextime_bot.simulation.benchmark import BenchmarkResult, run_benchmark
+from plextime_bot.simulation.scenario import generate_tenants
+from plextime_bot.simulation.simulator import Simulator, TenantReport
+from plextime_bot.utils.date_manager import current_local_date
+from plextime_bot.utils.logger import Logger
+
+LOGGER = Logger.get_logger("simulation")
+
+
+def start_simulation(args: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(description="Replay a full year of Plextime checks against a local stand-in")
+    parser.add_argument("--tenants", type=int, default=10, help="Number of simulated tenants")
+    parser.add_argument("--year", type=int, default=current_local_date().year, help="Year to replay")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for timetables, holidays, vacations and jitter")
+    parser.add_argument("--timezone", default=PLEXTIME_TIMEZONE, help="Timezone for the simulated checks")
+    parser.add_argument("--checkin-margin", type=int, default=900, help="Check-in random margin in seconds")
+    parser.add_argument("--checkout-margin", type=int, default=1800, help="Check-out random margin in seconds")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        help="Benchmark the throughput of sharding the tenants across each given number of worker processes",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Keep the bot logs enabled during the simulation")
+    options = parser.parse_args(args)
+
+    if not options.verbose:
+        for service in (
+            "plextime_bot",
+            "plextime_api_client",
+            "plextime_supervisor",
+            "telegram_notificator",
+            "profiler",
+        ):
+            logging.getLogger(service).setLevel(logging.WARNING)
+
+    if options.workers:
+        _benchmark(options)
+        return
+
+    random.seed(options.seed)
+
+    LOGGER.info("🧪 Simulating year %s for %s tenants", options.year, options.tenants)
+
+    reports = Simulator(
+        generate_tenants(options.tenants, options.year, options.seed, options.timezone),
+        options.year,
+        options.checkin_margin,
+        options.checkout_margin,
+    ).run()
+
+    for report in reports:
+        _log_report(report)
+
+    _log_summary(reports)
+
+
+def _log_report(report: TenantReport) -> None:
+    LOGGER.info(
+        "👤 Tenant %s: %s working days | ⏰ jobs %s | 🌐 requests %s | ❌ missed check-ins %s, missed check-outs %s,"
+        " duplicates %s, unexpected %s | ⏱️ %.3f ms CPU per day",
+        report.user_id,
+        report.expected_working_days,
+        dict(report.fired_jobs),
+        sum(report.issued_requests.values()),
+        len(report.missed_checkins),
+        len(report.missed_checkouts),
+        len(report.duplicate_checks),
+        len(report.unexpected_checks),
+        report.cpu_time_per_day * 1000,
+    )
+
+
+def _log_summary(reports: List[TenantReport]) -> None:
+    tenant_days = sum(r.days for r in reports)
+    cpu_time = sum(r.cpu_time for r in reports)
+    LOGGER.info(
+        "📊 %s tenant-days | ⏰ %s jobs fired | 🌐 %s requests issued | ❌ %s missed, %s duplicate, %s unexpected checks"
+        " | ⏱️ %.3f s CPU (%.3f ms per tenant-day)",
+        tenant_days,
+        sum(sum(r.fired_jobs.values()) for r in reports),
+        sum(sum(r.issued_requests.values()) for r in reports),
+        sum(len(r.missed_checkins) + len(r.missed_checkouts) for r in reports),
+        sum(len(r.duplicate_checks) for r in reports),
+        sum(len(r.unexpected_checks) for r in reports),
+        cpu_time,
+        cpu_time / tenant_days * 1000 if tenant_days else 0.0,
+    )
+
+
+def _benchmark(options: Namespace) -> None:
+    LOGGER.info("🏎️ Benchmarking year %s for %s tenants", options.year, options.tenants)
+
+    results: List[BenchmarkResult] = []
+    for workers in options.workers:
+        result = run_benchmark(
+            workers,
+            options.tenants,
+            options.year,
+            options.seed,
+            options.timezone,
+            options.checkin_margin,
+            options.checkout_margin,
+        )
+        results.append(result)
+        LOGGER.info(
+            "👷 %s workers: %s tenant-days in %.3f s | 🚀 %.1f tenant-days/s (x%.2f)",
+            result.workers,
+            result.tenant_days,
+            result.elapsed_time,
+            result.throughput,
+            result.throughput / results[0].throughput if results[0].throughput else 0.0,
+        )
@@ -0,0 +1,4 @@
+from plextime_bot.simulation import start_simulation
+
+if __name__ == "__main__":
+    start_simulation()
@@ -0,0 +1,87 @@
+import random
+from dataclasses import asdict, dataclass
+from datetime import date
+from functools import partial
+from json import dump
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING, List
+
+from plextime_bot.config.settings import TenantSettings
+from plextime_bot.plextime_supervisor import PlextimeSupervisor, WorkerMessage
+from plextime_bot.simulation.scenario import generate_tenants
+from plextime_bot.simulation.simulator import Simulator
+
+if TYPE_CHECKING:
+    from multiprocessing import Queue
+
+
+@dataclass
+class BenchmarkResult:
+    workers: int
+    tenant_days: int
+    elapsed_time: float
+
+    @property
+    def throughput(self) -> float:
+        return self.tenant_days / self.elapsed_time if self.elapsed_time else 0.0
+
+
+def run_benchmark(
+    workers: int,
+    tenants: int,
+    year: int,
+    seed: int,
+    timezone: str,
+    checkin_random_margin: int,
+    checkout_random_margin: int,
+) -> BenchmarkResult:
+    tenant_settings = [
+        TenantSettings(
+            user=tenant.email,
+            password=tenant.password,
+            timezone=tenant.timezone,
+            checkin_random_margin=checkin_random_margin,
+            checkout_random_margin=checkout_random_margin,
+            telegram_notifications=False,
+        )
+        for tenant in generate_tenants(tenants, year, seed, timezone)
+    ]
+
+    # The tenants go through the same supervisor, hash ring and worker processes as a real deployment
+    with TemporaryDirectory() as directory:
+        tenants_file = Path(directory) / "tenants.json"
+        with tenants_file.open("w", encoding="utf-8") as file:
+            dump([asdict(settings) for settings in tenant_settings], file)
+
+        supervisor = PlextimeSupervisor(
+            str(tenants_file),
+            workers,
+            partial(_simulate_shard, tenants, year, seed, timezone, checkin_random_margin, checkout_random_margin),
+        )
+
+        started_at = perf_counter()
+        supervisor.launch()
+        supervisor.join()
+        elapsed_time = perf_counter() - started_at
+
+    return BenchmarkResult(workers, tenants * (date(year + 1, 1, 1) - date(year, 1, 1)).days, elapsed_time)
+
+
+def _simulate_shard(
+    tenants: int,
+    year: int,
+    seed: int,
+    timezone: str,
+    checkin_random_margin: int,
+    checkout_random_margin: int,
+    _worker_id: str,
+    shard_settings: List[TenantSettings],
+    _commands: "Queue[WorkerMessage]",
+    _recover_missed_checks: bool,
+) -> None:
+    random.seed(seed)
+    users = {settings.user for settings in shard_settings}
+    shard_tenants = [t for t in generate_tenants(tenants, year, seed, timezone) if t.email in users]
+    Simulator(shard_tenants, year, checkin_random_margin, checkout_random_margin).run()
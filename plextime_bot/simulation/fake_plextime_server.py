@@ -0,0 +1,237 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from json import dumps, loads
+from re import fullmatch
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from pytz import timezone
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+
+from plextime_bot.config.constants import PLEXTIME_CRYPTO_KEY
+from plextime_bot.utils.aes_cipher import AESCipher
+from plextime_bot.utils.date_manager import DATE_FORMAT, DATETIME_FORMAT, with_utc_timezone
+
+FAKE_PLEXTIME_API_URL = "http://plextime.simulation/api/v1/"
+
+
+@dataclass
+class FakeTimetable:
+    timetable_id: int
+    name: str
+    entries: Dict[int, Tuple[str, str]]
+    begins: Optional[date] = None
+    ends: Optional[date] = None
+
+
+@dataclass
+class FakeRecord:
+    record_id: int
+    checkin: datetime
+    checkout: Optional[datetime] = None
+
+
+@dataclass
+class FakeTenant:
+    user_id: int
+    email: str
+    password: str
+    timetables: List[FakeTimetable]
+    holidays: List[date]
+    vacations: List[Tuple[date, date]]
+    locality_id: int = 1
+    timezone: str = "UTC"
+    records: List[FakeRecord] = field(default_factory=list)
+    requests: Counter = field(default_factory=Counter)
+
+    def active_timetable(self, day: date) -> FakeTimetable:
+        return next(
+            (t for t in self.timetables if t.begins is not None and t.ends is not None and t.begins <= day <= t.ends),
+            next(t for t in self.timetables if t.begins is None and t.ends is None),
+        )
+
+    def is_non_working_day(self, day: date) -> bool:
+        return day in self.holidays or any(begins <= day <= ends for begins, ends in self.vacations)
+
+    def is_expected_working_day(self, day: date) -> bool:
+        return not self.is_non_working_day(day) and day.isoweekday() in self.active_timetable(day).entries
+
+
+class FakePlextimeServer(BaseAdapter):
+    """Local stand-in for the Plextime API that can be mounted on a requests session."""
+
+    COMPANY_ID = 1
+    ROUTES = (
+        ("PUT", r"admin/login", "login"),
+        ("PUT", r"checkin_noloc", "checkin"),
+        ("PUT", r"checkout_noloc", "checkout"),
+        ("GET", r"admin/company/\d+/locality/(?P<locality_id>\d+)/holidays", "holidays"),
+        ("GET", r"vacations/company/\d+/user/\d+", "vacations"),
+        ("GET", r"admin/company/\d+/users/\d+/day/(?P<target_day>[\d-]+)", "day_info"),
+        ("GET", r"admin/company/\d+/users/\d+/timetable", "timetables"),
+        ("GET", r"admin/company/\d+/timetable/(?P<timetable_id>\d+)", "timetable"),
+    )
+
+    def __init__(self, tenants: List[FakeTenant]) -> None:
+        super().__init__()
+        self.__tenants_by_email = {t.email: t for t in tenants}
+        self.__holidays_by_locality = {t.locality_id: t.holidays for t in tenants}
+        self.__tenants_by_token = {f"token-{t.user_id}": t for t in tenants}
+        self.__next_record_id = 1
+
+    def send(
+        self,
+        request: PreparedRequest,
+        stream: bool = False,  # noqa: ARG002
+        timeout: Union[None, float, Tuple[float, float], Tuple[float, None]] = None,  # noqa: ARG002
+        verify: Union[bool, str] = True,  # noqa: ARG002
+        cert: Union[None, bytes, str, Tuple[Union[bytes, str], Union[bytes, str]]] = None,  # noqa: ARG002
+        proxies: Optional[Mapping[str, str]] = None,  # noqa: ARG002
+    ) -> Response:
+        url = urlsplit(request.url or "")
+        path = url.path[len(urlsplit(FAKE_PLEXTIME_API_URL).path) :]
+        route = next(
+            (
+                (name, match)
+                for method, pattern, name in self.ROUTES
+                if method == request.method and (match := fullmatch(pattern, path))
+            ),
+            None,
+        )
+
+        if route is None:
+            return self.__build_response(request, 404, {})
+
+        name, match = route
+        body = self.__decrypt_body(request.body) if request.method == "PUT" else {}
+        tenant = (
+            self.__tenants_by_email.get(body.get("email", ""))
+            if name == "login"
+            else self.__tenants_by_token.get(request.headers.get("Authorization", ""))
+        )
+
+        if tenant is None:
+            return self.__build_response(request, 401, {"result": "KO"})
+
+        tenant.requests[name] += 1
+        handlers: Dict[str, Callable[[], Any]] = {
+            "login": lambda: self.__login(tenant, body),
+            "checkin": lambda: self.__checkin(tenant, body),
+            "checkout": lambda: self.__checkout(tenant, body),
+            "holidays": lambda: self.__holidays(self.__holidays_by_locality.get(int(match["locality_id"]), [])),
+            "vacations": lambda: self.__vacations(tenant, parse_qs(url.query)),
+            "day_info": lambda: self.__day_info(tenant, date.fromisoformat(match["target_day"])),
+            "timetables": lambda: self.__timetables(tenant),
+            "timetable": lambda: self.__timetable(tenant, int(match["timetable_id"])),
+        }
+
+        return self.__build_response(request, 200, handlers[name]())
+
+    def close(self) -> None:
+        pass
+
+    def __login(self, tenant: FakeTenant, body: Dict[str, Any]) -> Dict[str, Any]:
+        if tenant.password != body.get("password"):
+            return {"result": "KO"}
+        return {
+            "result": "OK",
+            "user_id": tenant.user_id,
+            "company_id": self.COMPANY_ID,
+            "locality_id": tenant.locality_id,
+            "token": f"token-{tenant.user_id}",
+        }
+
+    def __holidays(self, holidays: List[date]) -> List[Dict[str, Any]]:
+        return [
+            {"name": "Holiday", "begins": self.__date_to_string(h), "ends": self.__date_to_string(h)}
+            for h in sorted(holidays)
+        ]
+
+    def __vacations(self, tenant: FakeTenant, query: Mapping[str, List[str]]) -> Dict[str, Any]:
+        date_from = date.fromisoformat(query["begin"][0])
+        date_to = date.fromisoformat(query["end"][0])
+        return {
+            "requests": [
+                {"init_date": self.__date_to_string(begins), "end_date": self.__date_to_string(ends), "status": 1}
+                for begins, ends in tenant.vacations
+                if begins <= date_to and ends >= date_from
+            ],
+        }
+
+    def __timetables(self, tenant: FakeTenant) -> Dict[str, Any]:
+        return {
+            "timetable": [
+                {
+                    "id": t.timetable_id,
+                    "init_date": self.__date_to_string(t.begins) if t.begins else None,
+                    "end_date": self.__date_to_string(t.ends) if t.ends else None,
+                    "status": True,
+                }
+                for t in tenant.timetables
+            ],
+        }
+
+    def __timetable(self, tenant: FakeTenant, timetable_id: int) -> Dict[str, Any]:
+        timetable = next(t for t in tenant.timetables if t.timetable_id == timetable_id)
+        return {
+            "id": timetable.timetable_id,
+            "name": timetable.name,
+            "description": f"{timetable.name} timetable",
+            "status": True,
+            "times": [
+                {"week_day": week_day, "hour_in": hour_in, "hour_out": hour_out, "lunch_time": 0, "break_time": 0}
+                for week_day, (hour_in, hour_out) in timetable.entries.items()
+            ],
+        }
+
+    def __day_info(self, tenant: FakeTenant, target_day: date) -> Dict[str, Any]:
+        return {
+            "checks": [
+                {
+                    "id": r.record_id,
+                    "checkin": r.checkin.strftime(DATETIME_FORMAT),
+                    "checkout": r.checkout.strftime(DATETIME_FORMAT) if r.checkout else None,
+                    "option_in": 8,
+                    "option_out": 8 if r.checkout else None,
+                }
+                for r in tenant.records
+                if r.checkin.astimezone(timezone(tenant.timezone)).date() == target_day
+            ],
+        }
+
+    def __checkin(self, tenant: FakeTenant, body: Dict[str, Any]) -> Dict[str, Any]:
+        tenant.records.append(FakeRecord(self.__next_record_id, self.__parse_datetime(body["date"])))
+        self.__next_record_id += 1
+        return {"result": "OK"}
+
+    def __checkout(self, tenant: FakeTenant, body: Dict[str, Any]) -> Dict[str, Any]:
+        record = next((r for r in tenant.records if r.record_id == int(body["id"])), None)
+        if record is None or record.checkout is not None:
+            return {"result": "KO"}
+        record.checkout = self.__parse_datetime(body["date"])
+        return {"result": "OK"}
+
+    @staticmethod
+    def __decrypt_body(body: Union[str, bytes, None]) -> Dict[str, Any]:
+        encrypted_value = loads(body or "{}").get("value", "")
+        return loads(loads(AESCipher(PLEXTIME_CRYPTO_KEY).decrypt(encrypted_value)))
+
+    @staticmethod
+    def __parse_datetime(value: str) -> datetime:
+        return with_utc_timezone(datetime.strptime(value, DATETIME_FORMAT))  # noqa: DTZ007
+
+    @staticmethod
+    def __date_to_string(value: date) -> str:
+        return f"{value.strftime(DATE_FORMAT)} 00:00:00"
+
+    @staticmethod
+    def __build_response(request: PreparedRequest, status: int, payload: Any) -> Response:
+        response = Response()
+        response.status_code = status
+        response._content = dumps(payload).encode()  # noqa: SLF001
+        response.headers["Content-Type"] = "application/json"
+        response.request = request
+        response.url = request.url or ""
+        return response
@@ -0,0 +1,80 @@
+from datetime import date, datetime, timedelta
+from random import Random
+from typing import Dict, List, Tuple
+
+from plextime_bot.simulation.fake_plextime_server import FakeTenant, FakeTimetable
+
+NATIONAL_HOLIDAYS = ((1, 1), (1, 6), (5, 1), (8, 15), (10, 12), (11, 1), (12, 6), (12, 8), (12, 25))
+HOURS_IN = ("07:30", "08:00", "08:30", "09:00", "09:30")
+LOCALITIES = 3
+VACATION_DAYS = 22
+
+
+def generate_tenants(count: int, year: int, seed: int, timezone: str) -> List[FakeTenant]:
+    randomizer = Random(seed)
+    # Tenants share localities and timetables, like the employees of a real company do
+    holidays = {locality_id: _generate_holidays(year, randomizer) for locality_id in range(1, LOCALITIES + 1)}
+    return [generate_tenant(user_id, year, randomizer, holidays, timezone) for user_id in range(1, count + 1)]
+
+
+def generate_tenant(
+    user_id: int,
+    year: int,
+    randomizer: Random,
+    holidays: Dict[int, List[date]],
+    timezone: str,
+) -> FakeTenant:
+    locality_id = (user_id - 1) % LOCALITIES + 1
+    return FakeTenant(
+        user_id=user_id,
+        email=f"tenant{user_id}@plextime.simulation",
+        password=f"password{user_id}",
+        timetables=_generate_timetables(year, randomizer),
+        holidays=holidays[locality_id],
+        vacations=_generate_vacations(year, randomizer),
+        locality_id=locality_id,
+        timezone=timezone,
+    )
+
+
+def _generate_timetables(year: int, randomizer: Random) -> List[FakeTimetable]:
+    hour_in_index = randomizer.randrange(len(HOURS_IN))
+    hour_in = HOURS_IN[hour_in_index]
+    regular_timetable = FakeTimetable(
+        timetable_id=hour_in_index * 10,
+        name="Regular",
+        entries={
+            **{week_day: (hour_in, _add_hours(hour_in, 9)) for week_day in range(1, 5)},
+            5: (hour_in, _add_hours(hour_in, 6)),
+        },
+    )
+    summer_timetable = FakeTimetable(
+        timetable_id=hour_in_index * 10 + 1,
+        name="Summer",
+        entries={week_day: (hour_in, _add_hours(hour_in, 7)) for week_day in range(1, 6)},
+        begins=date(year, 7, 1),
+        ends=date(year, 8, 31),
+    )
+    return [regular_timetable, summer_timetable]
+
+
+def _generate_holidays(year: int, randomizer: Random) -> List[date]:
+    local_holidays = [date(year, 1, 1) + timedelta(days=randomizer.randrange(365)) for _ in range(2)]
+    return [date(year, month, day) for month, day in NATIONAL_HOLIDAYS] + local_holidays
+
+
+def _generate_vacations(year: int, randomizer: Random) -> List[Tuple[date, date]]:
+    vacations = []
+    remaining_days = VACATION_DAYS
+
+    while remaining_days > 0:
+        length = min(remaining_days, randomizer.randint(1, 10))
+        begins = date(year, 1, 1) + timedelta(days=randomizer.randrange(365 - length))
+        vacations.append((begins, begins + timedelta(days=length - 1)))
+        remaining_days -= length
+
+    return vacations
+
+
+def _add_hours(hour: str, hours: int) -> str:
+    return (datetime.strptime(hour, "%H:%M") + timedelta(hours=hours)).strftime("%H:%M")  # noqa: DTZ007
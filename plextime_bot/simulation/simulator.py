@@ -0,0 +1,140 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from time import process_time
+from typing import List
+
+from pytz import timezone
+from requests import Session
+from schedule import Job, Scheduler
+
+from plextime_bot.config.settings import TenantSettings
+from plextime_bot.plextime_bot import PlextimeBot, TaskType
+from plextime_bot.simulation.fake_plextime_server import FAKE_PLEXTIME_API_URL, FakePlextimeServer, FakeTenant
+from plextime_bot.simulation.virtual_clock import VirtualClock
+
+
+class CountingScheduler(Scheduler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.fired_jobs: Counter = Counter()
+
+    def _run_job(self, job: Job) -> None:
+        self.fired_jobs.update(tag.name for tag in job.tags if isinstance(tag, TaskType) and tag != TaskType.CHECK)
+        super()._run_job(job)
+
+
+@dataclass
+class TenantReport:
+    user_id: int
+    days: int
+    expected_working_days: int
+    fired_jobs: Counter
+    issued_requests: Counter
+    missed_checkins: List[date] = field(default_factory=list)
+    missed_checkouts: List[date] = field(default_factory=list)
+    duplicate_checks: List[date] = field(default_factory=list)
+    unexpected_checks: List[date] = field(default_factory=list)
+    cpu_time: float = 0.0
+
+    @property
+    def cpu_time_per_day(self) -> float:
+        return self.cpu_time / self.days if self.days else 0.0
+
+
+class TenantRun:
+    def __init__(self, tenant: FakeTenant, settings: TenantSettings, session: Session, year: int) -> None:
+        self.tenant = tenant
+        self.scheduler = CountingScheduler()
+        self.cpu_time = 0.0
+        # The simulated year begins and ends in the timezone the tenant checks in and out
+        self.__timezone = timezone(tenant.timezone)
+        self.__first_day = date(year, 1, 1)
+        self.__clock = VirtualClock(self.__midnight(self.__first_day))
+        self.__bot = PlextimeBot(settings, FAKE_PLEXTIME_API_URL, session, self.scheduler, self.__clock.sleep)
+        self.__started = False
+
+    def run_day(self, offset: int) -> None:
+        run_until = self.__midnight(self.__first_day + timedelta(days=offset + 1))
+
+        with self.__clock.installed():
+            started_at = process_time()
+            if self.__started:
+                self.__bot.run(run_until)
+            else:
+                self.__started = True
+                self.__bot.start(run_until)
+            self.cpu_time += process_time() - started_at
+
+    def __midnight(self, day: date) -> datetime:
+        return self.__timezone.localize(datetime.combine(day, time()))
+
+
+class Simulator:
+    def __init__(
+        self,
+        tenants: List[FakeTenant],
+        year: int,
+        checkin_random_margin: int = 0,
+        checkout_random_margin: int = 0,
+    ) -> None:
+        self.__tenants = tenants
+        self.__server = FakePlextimeServer(tenants)
+        self.__year = year
+        self.__days = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+        self.__checkin_random_margin = checkin_random_margin
+        self.__checkout_random_margin = checkout_random_margin
+
+    def run(self) -> List[TenantReport]:
+        tenant_runs = [self.__build_tenant_run(tenant) for tenant in self.__tenants]
+
+        # Tenants are replayed day by day side by side, so they share the process-wide daily caches like in a worker
+        for offset in range(self.__days):
+            for tenant_run in tenant_runs:
+                tenant_run.run_day(offset)
+
+        return [self.__build_report(tenant_run) for tenant_run in tenant_runs]
+
+    def __build_tenant_run(self, tenant: FakeTenant) -> TenantRun:
+        session = Session()
+        session.trust_env = False
+        session.mount(FAKE_PLEXTIME_API_URL, self.__server)
+
+        settings = TenantSettings(
+            user=tenant.email,
+            password=tenant.password,
+            timezone=tenant.timezone,
+            checkin_random_margin=self.__checkin_random_margin,
+            checkout_random_margin=self.__checkout_random_margin,
+            telegram_notifications=False,
+        )
+
+        return TenantRun(tenant, settings, session, self.__year)
+
+    def __build_report(self, tenant_run: TenantRun) -> TenantReport:
+        tenant = tenant_run.tenant
+        tenant_timezone = timezone(tenant.timezone)
+        days = [date(self.__year, 1, 1) + timedelta(days=offset) for offset in range(self.__days)]
+        report = TenantReport(
+            user_id=tenant.user_id,
+            days=len(days),
+            expected_working_days=sum(1 for day in days if tenant.is_expected_working_day(day)),
+            fired_jobs=tenant_run.scheduler.fired_jobs,
+            issued_requests=tenant.requests,
+            cpu_time=tenant_run.cpu_time,
+        )
+
+        for day in days:
+            records = [r for r in tenant.records if r.checkin.astimezone(tenant_timezone).date() == day]
+            if not tenant.is_expected_working_day(day):
+                if records:
+                    report.unexpected_checks.append(day)
+                continue
+            if not records:
+                report.missed_checkins.append(day)
+            if len(records) > 1:
+                report.duplicate_checks.append(day)
+            if any(r.checkout is None for r in records):
+                report.missed_checkouts.append(day)
+
+        return report
@@ -0,0 +1,45 @@
+import datetime
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, Optional
+
+import schedule
+
+from plextime_bot.utils.date_manager import reset_utc_clock, set_utc_clock
+
+
+class VirtualClock:
+    def __init__(self, start: datetime.datetime) -> None:
+        self.__now = start.astimezone(datetime.timezone.utc)
+
+    def now(self) -> datetime.datetime:
+        return self.__now
+
+    def sleep(self, seconds: float) -> None:
+        self.__now += datetime.timedelta(seconds=max(seconds, 0))
+
+    @contextmanager
+    def installed(self) -> Iterator["VirtualClock"]:
+        original_datetime_module = schedule.datetime
+        schedule.datetime = self.__virtual_datetime_module()
+        set_utc_clock(self.now)
+        try:
+            yield self
+        finally:
+            schedule.datetime = original_datetime_module
+            reset_utc_clock()
+
+    def __virtual_datetime_module(self) -> ModuleType:
+        clock = self
+
+        class VirtualDatetime(datetime.datetime):
+            @classmethod
+            def now(cls, tz: Optional[datetime.tzinfo] = None) -> datetime.datetime:  # type: ignore[override]
+                if tz is None:
+                    return clock.now().astimezone().replace(tzinfo=None)
+                return clock.now().astimezone(tz)
+
+        virtual_datetime_module = ModuleType("datetime")
+        virtual_datetime_module.__dict__.update(vars(datetime))
+        virtual_datetime_module.datetime = VirtualDatetime  # type: ignore[attr-defined]
+        return virtual_datetime_module
@@ -0,0 +1,28 @@
+from collections.abc import Hashable
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class DailyCache:
+    """Process-wide cache whose entries are only valid for the day they were loaded for."""
+
+    def __init__(self) -> None:
+        self.__entries: Dict[Tuple[Hashable, date], Any] = {}
+        self.__lock = Lock()
+
+    def get_or_load(self, key: Hashable, day: date, loader: Callable[[], T]) -> T:
+        with self.__lock:
+            if (key, day) in self.__entries:
+                return self.__entries[(key, day)]
+
+        value = loader()
+
+        with self.__lock:
+            # Tenants in different timezones may be a day apart, so the previous day is kept as well
+            self.__entries = {k: v for k, v in self.__entries.items() if k[1] >= day - timedelta(days=1)}
+            self.__entries[(key, day)] = value
+
+        return value
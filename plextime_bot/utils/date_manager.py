@@ -1,15 +1,33 @@
 from datetime import date, datetime, timezone
-from typing import Union
+from typing import Callable, Union
+
+from pytz import timezone as get_timezone
 
 DATE_FORMAT = "%Y-%m-%d"
 DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 HUMAN_READABLE_DATETIME_FORMAT = "%d/%m/%Y at %H:%M:%S"
 
 
-def current_utc_datetime() -> datetime:
+def system_utc_datetime() -> datetime:
     return datetime.now(timezone.utc)
 
 
+_utc_clock: Callable[[], datetime] = system_utc_datetime
+
+
+def set_utc_clock(clock: Callable[[], datetime]) -> None:
+    global _utc_clock  # noqa: PLW0603
+    _utc_clock = clock
+
+
+def reset_utc_clock() -> None:
+    set_utc_clock(system_utc_datetime)
+
+
+def current_utc_datetime() -> datetime:
+    return _utc_clock()
+
+
 def current_utc_date() -> date:
     return current_utc_datetime().date()
 
@@ -22,6 +40,14 @@ def current_local_date() -> date:
     return current_local_datetime().date()
 
 
+def current_datetime_in(timezone_name: str) -> datetime:
+    return current_utc_datetime().astimezone(get_timezone(timezone_name))
+
+
+def current_date_in(timezone_name: str) -> date:
+    return current_datetime_in(timezone_name).date()
+
+
 def start_of_year_local() -> date:
     return date(current_local_datetime().year, 1, 1)
 
@@ -41,3 +67,7 @@ def to_string(value: Union[datetime, date]) -> str:
 
 def current_local_datetime_human_readable() -> str:
     return current_local_datetime().strftime(HUMAN_READABLE_DATETIME_FORMAT)
+
+
+def current_datetime_human_readable_in(timezone_name: str) -> str:
+    return current_datetime_in(timezone_name).strftime(HUMAN_READABLE_DATETIME_FORMAT)
@@ -0,0 +1,49 @@
+from bisect import bisect, insort
+from hashlib import md5
+from typing import Dict, Iterable, List, Tuple
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100) -> None:
+        self.__replicas = replicas
+        self.__ring: List[Tuple[int, str]] = []
+        self.__nodes: List[str] = []
+
+        for node in nodes:
+            self.add_node(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        return list(self.__nodes)
+
+    def add_node(self, node: str) -> None:
+        if node in self.__nodes:
+            return
+
+        self.__nodes.append(node)
+        for replica in range(self.__replicas):
+            insort(self.__ring, (self.__hash(f"{node}#{replica}"), node))
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.__nodes:
+            return
+
+        self.__nodes.remove(node)
+        self.__ring = [(h, n) for h, n in self.__ring if n != node]
+
+    def get_node(self, key: str) -> str:
+        if not self.__ring:
+            raise ValueError("The hash ring has no nodes")
+
+        index = bisect(self.__ring, (self.__hash(key), "")) % len(self.__ring)
+        return self.__ring[index][1]
+
+    def distribute(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        distribution: Dict[str, List[str]] = {node: [] for node in self.__nodes}
+        for key in keys:
+            distribution[self.get_node(key)].append(key)
+        return distribution
+
+    @staticmethod
+    def __hash(value: str) -> int:
+        return int(md5(value.encode()).hexdigest(), 16)
@@ -0,0 +1,200 @@
+import cProfile
+import re
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from random import random
+from threading import Lock, local
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from plextime_bot.config.constants import (
+    PLEXTIME_PROFILING,
+    PLEXTIME_PROFILING_DIR,
+    PLEXTIME_PROFILING_MAX_FILES,
+    PLEXTIME_PROFILING_SAMPLE_RATE,
+)
+from plextime_bot.utils.date_manager import current_utc_datetime
+from plextime_bot.utils.logger import Logger
+
+LOGGER = Logger.get_logger("profiler")
+
+F = TypeVar("F", bound=Callable[..., Any])
+JobTiming = Tuple[str, float, Dict[str, float]]
+
+_current_job = local()
+_tracemalloc_lock = Lock()
+_tracemalloc_users = 0
+
+
+@contextmanager
+def profiled_tenant(tenant: Optional[str]) -> Iterator[None]:
+    previous_tenant = getattr(_current_job, "tenant", None)
+    _current_job.tenant = tenant
+    try:
+        yield
+    finally:
+        _current_job.tenant = previous_tenant
+
+
+def profiled_job(name: str, leading: bool = False) -> Callable[[F], F]:
+    def decorator(function: F) -> F:
+        if not PLEXTIME_PROFILING:
+            return function
+
+        _validate_sample_rate()
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if getattr(_current_job, "phases", None) is not None:
+                return function(*args, **kwargs)
+
+            profiler = cProfile.Profile() if random() < PLEXTIME_PROFILING_SAMPLE_RATE else None
+            _current_job.phases = {}
+            started_at = perf_counter()
+
+            if profiler:
+                try:
+                    profiler.enable()
+                    _start_tracemalloc()
+                except ValueError:
+                    # Only one profiler can be active at a time, so concurrent sampled jobs are skipped
+                    profiler = None
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                if profiler:
+                    profiler.disable()
+
+                tenant = getattr(_current_job, "tenant", None)
+                timing = (name, perf_counter() - started_at, _current_job.phases)
+                _current_job.phases = None
+                _complete_job(tenant, timing, leading)
+
+                if profiler:
+                    _dump_profile(name, tenant, profiler)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def profiled_phase(name: str) -> Callable[[F], F]:
+    def decorator(function: F) -> F:
+        if not PLEXTIME_PROFILING:
+            return function
+
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            phases: Optional[Dict[str, float]] = getattr(_current_job, "phases", None)
+
+            if phases is None:
+                return function(*args, **kwargs)
+
+            started_at = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                phases[name] = phases.get(name, 0.0) + perf_counter() - started_at
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def _validate_sample_rate() -> None:
+    if not 0 <= PLEXTIME_PROFILING_SAMPLE_RATE <= 1:
+        LOGGER.error("🚨 'PLEXTIME_PROFILING_SAMPLE_RATE' must be between 0 and 1")
+        raise ValueError("'PLEXTIME_PROFILING_SAMPLE_RATE' must be between 0 and 1")
+
+
+def _complete_job(tenant: Optional[str], timing: JobTiming, leading: bool) -> None:
+    # A leading job, such as the pre-warm of a check, is logged along with the job that follows it
+    leading_job: Optional[Tuple[Optional[str], JobTiming]] = getattr(_current_job, "leading_job", None)
+    _current_job.leading_job = None
+
+    if leading_job and leading_job[0] != tenant:
+        _log_phases(leading_job[0], [leading_job[1]])
+        leading_job = None
+
+    if leading:
+        if leading_job:
+            _log_phases(tenant, [leading_job[1]])
+        _current_job.leading_job = (tenant, timing)
+        return
+
+    _log_phases(tenant, [leading_job[1], timing] if leading_job else [timing])
+
+
+def _log_phases(tenant: Optional[str], timings: List[JobTiming]) -> None:
+    breakdowns = []
+    for name, elapsed_time, phases in timings:
+        durations = {**phases, "other": elapsed_time - sum(phases.values())}
+        breakdown = " | ".join(f"{phase} {duration * 1000:.1f} ms" for phase, duration in durations.items())
+        breakdowns.append(f"{name} {elapsed_time * 1000:.1f} ms: {breakdown}")
+
+    LOGGER.info(
+        "⏱️ Job %s for 👤 %s took %.1f ms (%s)",
+        timings[-1][0],
+        tenant,
+        sum(elapsed_time for _, elapsed_time, _ in timings) * 1000,
+        "; ".join(breakdowns),
+    )
+
+
+def _start_tracemalloc() -> None:
+    global _tracemalloc_users  # noqa: PLW0603
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracemalloc_users += 1
+
+
+def _stop_tracemalloc() -> Optional[tracemalloc.Snapshot]:
+    global _tracemalloc_users  # noqa: PLW0603
+    with _tracemalloc_lock:
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0:
+            tracemalloc.stop()
+        return snapshot
+
+
+def _dump_profile(name: str, tenant: Optional[str], profiler: cProfile.Profile) -> None:
+    snapshot = _stop_tracemalloc()
+    profiles_dir = Path(PLEXTIME_PROFILING_DIR)
+    # Dots are kept out of the base name since they separate it from the extensions when rotating
+    tenant_name = re.sub(r"[^\w-]", "_", tenant or "unknown")
+    base_name = f"{current_utc_datetime():%Y%m%d%H%M%S%f}-{name}-{tenant_name}"
+
+    try:
+        profiles_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(profiles_dir / f"{base_name}.prof")
+
+        if snapshot:
+            top_stats = snapshot.statistics("lineno")[:25]
+            (profiles_dir / f"{base_name}.tracemalloc.txt").write_text(
+                "\n".join(str(stat) for stat in top_stats),
+                encoding="utf-8",
+            )
+
+        _rotate_profiles(profiles_dir)
+    except OSError as e:
+        LOGGER.error("🚨 An error ocurred while writing the profile of job %s - %s", name, e)
+        return
+
+    LOGGER.info("🔬 Profile of job %s written to %s", name, profiles_dir / base_name)
+
+
+def _rotate_profiles(profiles_dir: Path) -> None:
+    # Every dump may write several files sharing the same base name, which are kept or removed together
+    dumps: Dict[str, List[Path]] = {}
+    for profile in profiles_dir.iterdir():
+        dumps.setdefault(profile.name.split(".", 1)[0], []).append(profile)
+
+    sorted_dumps = sorted(dumps.values(), key=lambda files: max(f.stat().st_mtime for f in files), reverse=True)
+    for files in sorted_dumps[PLEXTIME_PROFILING_MAX_FILES:]:
+        for profile in files:
+            profile.unlink(missing_ok=True)
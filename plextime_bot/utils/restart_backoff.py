@@ -0,0 +1,40 @@
+from time import monotonic
+from typing import Dict, List
+
+
+class RestartBackoff:
+    """Doubles the restart delay of whatever keeps failing soon after being started, up to a maximum."""
+
+    def __init__(self, initial_delay: float, max_delay: float) -> None:
+        self.__initial_delay = initial_delay
+        self.__max_delay = max_delay
+        self.__started_at: Dict[str, float] = {}
+        self.__failures: Dict[str, int] = {}
+        self.__restart_at: Dict[str, float] = {}
+
+    def started(self, key: str) -> None:
+        self.__started_at[key] = monotonic()
+
+    def failed(self, key: str) -> float:
+        now = monotonic()
+        lived_long_enough = now - self.__started_at.get(key, now) >= self.__max_delay
+        failures = 0 if lived_long_enough else self.__failures.get(key, -1) + 1
+        delay = min(self.__initial_delay * 2**failures, self.__max_delay)
+        self.__failures[key] = failures
+        self.__restart_at[key] = now + delay
+        return delay
+
+    def is_pending(self, key: str) -> bool:
+        return key in self.__restart_at
+
+    def pop_due(self) -> List[str]:
+        now = monotonic()
+        due_keys = [key for key, restart_at in self.__restart_at.items() if restart_at <= now]
+        for key in due_keys:
+            del self.__restart_at[key]
+        return due_keys
+
+    def forget(self, key: str) -> None:
+        self.__started_at.pop(key, None)
+        self.__failures.pop(key, None)
+        self.__restart_at.pop(key, None)
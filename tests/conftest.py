@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+from typing import Iterator
+
+import pytest
+
+from plextime_bot.simulation.virtual_clock import VirtualClock
+
+MONDAY_NOON = datetime(2024, 3, 4, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def clock() -> Iterator[VirtualClock]:
+    with VirtualClock(MONDAY_NOON).installed() as virtual_clock:
+        yield virtual_clock
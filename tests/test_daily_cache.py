@@ -0,0 +1,41 @@
+from datetime import date
+from typing import List
+
+from plextime_bot.utils.daily_cache import DailyCache
+
+MONDAY = date(2024, 3, 4)
+TUESDAY = date(2024, 3, 5)
+THURSDAY = date(2024, 3, 7)
+
+
+def test_values_are_loaded_once_per_day() -> None:
+    cache = DailyCache()
+    loads: List[str] = []
+
+    def loader() -> str:
+        loads.append("value")
+        return f"value-{len(loads)}"
+
+    assert cache.get_or_load("key", MONDAY, loader) == "value-1"
+    assert cache.get_or_load("key", MONDAY, loader) == "value-1"
+    assert len(loads) == 1
+
+
+def test_values_expire_when_the_day_changes() -> None:
+    cache = DailyCache()
+    cache.get_or_load("key", MONDAY, lambda: "monday")
+
+    assert cache.get_or_load("key", TUESDAY, lambda: "tuesday") == "tuesday"
+    assert cache.get_or_load("key", TUESDAY, lambda: "ignored") == "tuesday"
+
+
+def test_values_of_the_previous_day_are_kept_for_tenants_behind_in_time() -> None:
+    cache = DailyCache()
+    cache.get_or_load("key", MONDAY, lambda: "monday")
+    cache.get_or_load("key", TUESDAY, lambda: "tuesday")
+
+    assert cache.get_or_load("key", MONDAY, lambda: "ignored") == "monday"
+
+    cache.get_or_load("key", THURSDAY, lambda: "thursday")
+
+    assert cache.get_or_load("key", MONDAY, lambda: "reloaded") == "reloaded"
@@ -0,0 +1,34 @@
+from plextime_bot.utils.hash_ring import HashRing
+
+KEYS = [f"user{index}" for index in range(1000)]
+
+
+def test_adding_a_node_only_moves_keys_to_it() -> None:
+    hash_ring = HashRing(f"worker-{index}" for index in range(4))
+    owners = {key: hash_ring.get_node(key) for key in KEYS}
+
+    hash_ring.add_node("worker-4")
+
+    moved_keys = [key for key in KEYS if hash_ring.get_node(key) != owners[key]]
+    assert moved_keys
+    assert len(moved_keys) < len(KEYS) / 3
+    assert all(hash_ring.get_node(key) == "worker-4" for key in moved_keys)
+
+
+def test_removing_a_node_only_moves_its_keys() -> None:
+    hash_ring = HashRing(f"worker-{index}" for index in range(5))
+    owners = {key: hash_ring.get_node(key) for key in KEYS}
+
+    hash_ring.remove_node("worker-4")
+
+    moved_keys = [key for key in KEYS if hash_ring.get_node(key) != owners[key]]
+    assert moved_keys == [key for key in KEYS if owners[key] == "worker-4"]
+
+
+def test_distribute_assigns_every_key_to_a_single_node() -> None:
+    hash_ring = HashRing(f"worker-{index}" for index in range(3))
+
+    distribution = hash_ring.distribute(KEYS)
+
+    assert sorted(distribution) == hash_ring.nodes
+    assert sorted(key for keys in distribution.values() for key in keys) == sorted(KEYS)
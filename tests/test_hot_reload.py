@@ -0,0 +1,169 @@
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from json import loads
+from typing import Any, Dict, List, Optional
+
+import pytest
+from requests import PreparedRequest, Response, Session
+from schedule import Job, Scheduler
+
+from plextime_bot import plextime_bot
+from plextime_bot.config.constants import PLEXTIME_CRYPTO_KEY
+from plextime_bot.config.settings import TenantSettings
+from plextime_bot.plextime_bot import PlextimeBot, PlextimeBotError, TaskType
+from plextime_bot.services.plextime_api_client import PlextimeApiClient
+from plextime_bot.simulation.fake_plextime_server import (
+    FAKE_PLEXTIME_API_URL,
+    FakePlextimeServer,
+    FakeTenant,
+    FakeTimetable,
+)
+from plextime_bot.simulation.virtual_clock import VirtualClock
+from plextime_bot.utils.aes_cipher import AESCipher
+
+SETTINGS = TenantSettings(
+    user="tenant1@plextime.simulation",
+    password="password1",
+    timezone="UTC",
+    checkin_random_margin=0,
+    checkout_random_margin=0,
+    prewarm_lead_time=60,
+    telegram_notifications=False,
+)
+MONDAY_MORNING = datetime(2024, 3, 11, 6, 0, tzinfo=timezone.utc)
+MONDAY_AFTER_CHECKIN = datetime(2024, 3, 11, 9, 0, tzinfo=timezone.utc)
+
+
+class RecordingPlextimeServer(FakePlextimeServer):
+    def __init__(self, tenants: List[FakeTenant]) -> None:
+        super().__init__(tenants)
+        self.bodies: List[Dict[str, Any]] = []
+
+    def send(self, request: PreparedRequest, **kwargs: Any) -> Response:
+        if request.method == "PUT":
+            encrypted_value = loads(request.body or "{}").get("value", "")
+            self.bodies.append(loads(loads(AESCipher(PLEXTIME_CRYPTO_KEY).decrypt(encrypted_value))))
+        return super().send(request, **kwargs)
+
+
+class HotReloadScenario:
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.tenant = FakeTenant(
+            user_id=1,
+            email=SETTINGS.user,  # type: ignore[arg-type]
+            password=SETTINGS.password,  # type: ignore[arg-type]
+            timetables=[FakeTimetable(10, "Regular", {1: ("08:00:00", "17:00:00")})],
+            holidays=[],
+            vacations=[],
+        )
+        self.server = RecordingPlextimeServer([self.tenant])
+        self.scheduler = Scheduler()
+        session = Session()
+        session.trust_env = False
+        session.mount(FAKE_PLEXTIME_API_URL, self.server)
+        clock.sleep((MONDAY_MORNING - clock.now()).total_seconds())
+        self.bot = PlextimeBot(SETTINGS, FAKE_PLEXTIME_API_URL, session, self.scheduler, clock.sleep)
+        self.bot.start(run_until=MONDAY_MORNING)
+
+    @property
+    def checkin_job(self) -> Job:
+        return self.scheduler.get_jobs(TaskType.CHECK_IN)[0]
+
+    @property
+    def checkin_options(self) -> List[Optional[int]]:
+        return [body.get("optionId") for body in self.server.bodies if "optionId" in body]
+
+    def reload(self, settings: TenantSettings) -> None:
+        self.bot.update_settings(settings)
+        self.bot.run(self.clock.now() + timedelta(minutes=1))
+
+
+@pytest.fixture
+def scenario(clock: VirtualClock) -> HotReloadScenario:
+    return HotReloadScenario(clock)
+
+
+@pytest.fixture
+def _max_random_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(plextime_bot, "randint", lambda _min_val, max_val: max_val)
+
+
+def test_invalid_timezones_are_rejected() -> None:
+    bot = PlextimeBot(SETTINGS)
+
+    with pytest.raises(PlextimeBotError):
+        bot.update_settings(replace(SETTINGS, timezone="Mars/Olympus"))
+
+
+@pytest.mark.usefixtures("_max_random_time")
+def test_margin_and_journal_changes_keep_the_scheduled_checks(scenario: HotReloadScenario) -> None:
+    checkin_job = scenario.checkin_job
+
+    scenario.reload(replace(SETTINGS, checkin_random_margin=120, checkin_journal_option=7))
+    scenario.bot.run(MONDAY_AFTER_CHECKIN)
+
+    assert scenario.checkin_job is checkin_job
+    assert scenario.tenant.records[0].checkin == datetime(2024, 3, 11, 8, 2, tzinfo=timezone.utc)
+    assert scenario.checkin_options == [7]
+
+
+@pytest.mark.parametrize(
+    ("changes", "shift"),
+    [
+        ({"prewarm_lead_time": 300}, timedelta(minutes=-4)),
+        ({"timezone": "Europe/Madrid"}, timedelta(hours=-1)),
+    ],
+)
+def test_timezone_and_lead_time_changes_reschedule_the_checks(
+    scenario: HotReloadScenario,
+    changes: Dict[str, Any],
+    shift: timedelta,
+) -> None:
+    checkin_job = scenario.checkin_job
+
+    scenario.reload(replace(SETTINGS, **changes))
+
+    assert scenario.checkin_job is not checkin_job
+    assert scenario.checkin_job.next_run == checkin_job.next_run + shift  # type: ignore[operator]
+
+
+@pytest.mark.usefixtures("_max_random_time")
+def test_settings_are_rolled_back_when_they_cannot_be_applied(
+    scenario: HotReloadScenario,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    checkin_job = scenario.checkin_job
+    reconfigure = PlextimeApiClient.reconfigure
+    failures = iter([True])
+
+    def reconfigure_failing_once(client: PlextimeApiClient, *args: Any) -> None:
+        if next(failures, False):
+            raise RuntimeError("Reconfiguration failed")
+        reconfigure(client, *args)
+
+    monkeypatch.setattr(PlextimeApiClient, "reconfigure", reconfigure_failing_once)
+
+    scenario.reload(replace(SETTINGS, checkin_random_margin=120, checkin_journal_option=7, prewarm_lead_time=300))
+
+    assert scenario.checkin_job.next_run == checkin_job.next_run
+
+    scenario.bot.run(MONDAY_AFTER_CHECKIN)
+
+    assert scenario.tenant.records[0].checkin == datetime(2024, 3, 11, 8, 0, tzinfo=timezone.utc)
+    assert scenario.checkin_options == [SETTINGS.checkin_journal_option]
+
+
+def test_a_failed_rollback_does_not_stop_the_bot(
+    scenario: HotReloadScenario,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def reconfigure_always_failing(_client: PlextimeApiClient, *_args: Any) -> None:
+        raise RuntimeError("Reconfiguration failed")
+
+    monkeypatch.setattr(PlextimeApiClient, "reconfigure", reconfigure_always_failing)
+
+    scenario.reload(replace(SETTINGS, checkin_random_margin=120))
+    scenario.bot.run(MONDAY_AFTER_CHECKIN)
+
+    assert scenario.tenant.records[0].checkin == datetime(2024, 3, 11, 8, 0, tzinfo=timezone.utc)
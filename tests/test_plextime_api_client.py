@@ -0,0 +1,106 @@
+from datetime import date, datetime, timezone
+from typing import Any, List, Tuple
+
+from requests import PreparedRequest, Response, Session
+
+from plextime_bot.services.plextime_api_client import PlextimeApiClient
+from plextime_bot.simulation.fake_plextime_server import (
+    FAKE_PLEXTIME_API_URL,
+    FakePlextimeServer,
+    FakeTenant,
+    FakeTimetable,
+)
+from plextime_bot.simulation.virtual_clock import VirtualClock
+
+
+class FlakyPlextimeServer(FakePlextimeServer):
+    def __init__(self, tenants: List[FakeTenant], failing_checkins: int) -> None:
+        super().__init__(tenants)
+        self.failing_checkins = failing_checkins
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        if self.failing_checkins and (request.url or "").endswith("checkin_noloc"):
+            self.failing_checkins -= 1
+            response = Response()
+            response.status_code = 500
+            response.request = request
+            return response
+        return super().send(request, *args, **kwargs)
+
+
+def build_client(
+    failing_checkins: int = 0,
+    holidays: Tuple[date, ...] = (),
+    tenant_timezone: str = "UTC",
+) -> Tuple[PlextimeApiClient, FakeTenant]:
+    tenant = FakeTenant(
+        user_id=1,
+        email="tenant1@plextime.simulation",
+        password="password1",
+        timetables=[FakeTimetable(10, "Regular", {day: ("08:00", "17:00") for day in range(1, 8)})],
+        holidays=list(holidays),
+        vacations=[],
+        locality_id=len(holidays) + 1,
+        timezone=tenant_timezone,
+    )
+    session = Session()
+    session.trust_env = False
+    session.mount(FAKE_PLEXTIME_API_URL, FlakyPlextimeServer([tenant], failing_checkins))
+    client = PlextimeApiClient(
+        FAKE_PLEXTIME_API_URL,
+        tenant.email,
+        tenant.password,
+        timezone=tenant_timezone,
+        session=session,
+    )
+    return client, tenant
+
+
+def test_prewarmed_day_is_used_by_the_next_check_only(clock: VirtualClock) -> None:
+    client, tenant = build_client()
+
+    client.prewarm()
+    assert client.checkin_if_working_day_and_not_checkedin_before()
+    assert tenant.requests["login"] == 1
+    assert tenant.requests["day_info"] == 1
+
+    clock.sleep(60)
+    assert client.checkout_if_checkedin_before()
+    assert tenant.requests["login"] == 2
+    assert tenant.requests["day_info"] == 2
+    assert tenant.records[0].checkout is not None
+
+
+def test_prewarmed_day_is_discarded_once_the_day_changes(clock: VirtualClock) -> None:
+    client, tenant = build_client()
+
+    client.prewarm()
+    clock.sleep(24 * 60 * 60)
+
+    assert client.checkin_if_working_day_and_not_checkedin_before()
+    assert tenant.requests["day_info"] == 2
+    assert tenant.records[0].checkin == clock.now().replace(microsecond=0)
+
+
+def test_check_is_retried_from_scratch_when_the_prewarmed_write_fails(clock: VirtualClock) -> None:
+    client, tenant = build_client(failing_checkins=1)
+
+    client.prewarm()
+
+    assert client.checkin_if_working_day_and_not_checkedin_before()
+    assert tenant.requests["login"] == 2
+    assert tenant.requests["day_info"] == 2
+    assert len(tenant.records) == 1
+
+
+def test_days_are_those_of_the_tenant_timezone(clock: VirtualClock) -> None:
+    # Monday evening in Los Angeles is already Tuesday in UTC, which is a public holiday there
+    client, tenant = build_client(holidays=(date(2024, 3, 5),), tenant_timezone="America/Los_Angeles")
+    clock.sleep((datetime(2024, 3, 5, 2, 0, tzinfo=timezone.utc) - clock.now()).total_seconds())
+
+    assert client.checkin_if_working_day_and_not_checkedin_before()
+
+    clock.sleep(2 * 60 * 60)
+
+    assert client.checkout_if_checkedin_before()
+    assert tenant.records[0].checkout is not None
@@ -0,0 +1,122 @@
+from datetime import datetime, timezone
+
+from requests import Session
+from schedule import Scheduler
+
+from plextime_bot.config.settings import TenantSettings
+from plextime_bot.plextime_bot import PlextimeBot, TaskType
+from plextime_bot.simulation.fake_plextime_server import (
+    FAKE_PLEXTIME_API_URL,
+    FakePlextimeServer,
+    FakeRecord,
+    FakeTenant,
+    FakeTimetable,
+)
+from plextime_bot.simulation.virtual_clock import VirtualClock
+
+SETTINGS = TenantSettings(
+    user="tenant1@plextime.simulation",
+    password="password1",
+    timezone="UTC",
+    checkin_random_margin=0,
+    checkout_random_margin=0,
+    prewarm_lead_time=60,
+    telegram_notifications=False,
+)
+
+
+def build_tenant() -> FakeTenant:
+    return FakeTenant(
+        user_id=1,
+        email=SETTINGS.user,  # type: ignore[arg-type]
+        password=SETTINGS.password,  # type: ignore[arg-type]
+        timetables=[FakeTimetable(10, "Regular", {1: ("08:00:00", "17:00:00")})],
+        holidays=[],
+        vacations=[],
+    )
+
+
+def run_bot(clock: VirtualClock, tenant: FakeTenant, start: datetime, end: datetime) -> None:
+    session = Session()
+    session.trust_env = False
+    session.mount(FAKE_PLEXTIME_API_URL, FakePlextimeServer([tenant]))
+    clock.sleep((start - clock.now()).total_seconds())
+    bot = PlextimeBot(SETTINGS, FAKE_PLEXTIME_API_URL, session, sleep_function=clock.sleep)
+    bot.start(run_until=end, recover_missed_checks=True)
+
+
+def test_checks_are_moved_ahead_to_the_previous_day_when_needed(clock: VirtualClock) -> None:
+    tenant = build_tenant()
+    tenant.timetables = [FakeTimetable(10, "Regular", {1: ("00:00:00", "09:00:00"), 3: ("08:00:00", "17:00:00")})]
+    session = Session()
+    session.trust_env = False
+    session.mount(FAKE_PLEXTIME_API_URL, FakePlextimeServer([tenant]))
+    scheduler = Scheduler()
+    bot = PlextimeBot(SETTINGS, FAKE_PLEXTIME_API_URL, session, scheduler, clock.sleep)
+
+    bot.start(run_until=clock.now())
+
+    assert sorted(job.next_run for job in scheduler.get_jobs(TaskType.CHECK_IN)) == [  # type: ignore[type-var]
+        datetime(2024, 3, 6, 7, 59, tzinfo=timezone.utc).astimezone().replace(tzinfo=None),
+        datetime(2024, 3, 10, 23, 59, tzinfo=timezone.utc).astimezone().replace(tzinfo=None),
+    ]
+
+
+def test_checkin_is_recovered_when_starting_within_its_lead_time(clock: VirtualClock) -> None:
+    tenant = build_tenant()
+
+    run_bot(
+        clock,
+        tenant,
+        datetime(2024, 3, 11, 7, 59, 30, tzinfo=timezone.utc),
+        datetime(2024, 3, 11, 20, 0, tzinfo=timezone.utc),
+    )
+
+    assert [(r.checkin.hour, r.checkout and r.checkout.hour) for r in tenant.records] == [(8, 17)]
+
+
+def test_checkout_is_recovered_when_starting_within_its_lead_time(clock: VirtualClock) -> None:
+    tenant = build_tenant()
+    tenant.records.append(FakeRecord(1, datetime(2024, 3, 11, 8, 0, tzinfo=timezone.utc)))
+
+    run_bot(
+        clock,
+        tenant,
+        datetime(2024, 3, 11, 16, 59, 30, tzinfo=timezone.utc),
+        datetime(2024, 3, 11, 20, 0, tzinfo=timezone.utc),
+    )
+
+    assert tenant.records[0].checkout == datetime(2024, 3, 11, 17, 0, tzinfo=timezone.utc)
+
+
+def test_checkin_is_not_recovered_after_the_user_checked_out_by_hand(clock: VirtualClock) -> None:
+    tenant = build_tenant()
+    tenant.records.append(
+        FakeRecord(
+            1,
+            datetime(2024, 3, 11, 8, 0, tzinfo=timezone.utc),
+            datetime(2024, 3, 11, 12, 0, tzinfo=timezone.utc),
+        ),
+    )
+
+    run_bot(
+        clock,
+        tenant,
+        datetime(2024, 3, 11, 14, 0, tzinfo=timezone.utc),
+        datetime(2024, 3, 11, 16, 0, tzinfo=timezone.utc),
+    )
+
+    assert len(tenant.records) == 1
+
+
+def test_checkin_is_recovered_when_nothing_was_recorded_for_the_day(clock: VirtualClock) -> None:
+    tenant = build_tenant()
+
+    run_bot(
+        clock,
+        tenant,
+        datetime(2024, 3, 11, 14, 0, tzinfo=timezone.utc),
+        datetime(2024, 3, 11, 16, 0, tzinfo=timezone.utc),
+    )
+
+    assert [r.checkin.hour for r in tenant.records] == [14]
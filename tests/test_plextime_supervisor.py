@@ -0,0 +1,191 @@
+import os
+from dataclasses import asdict
+from json import dump
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from plextime_bot import plextime_supervisor
+from plextime_bot.config.settings import TenantSettings
+from plextime_bot.plextime_supervisor import PlextimeSupervisor, WorkerCommand
+from plextime_bot.utils import restart_backoff
+from plextime_bot.utils.hash_ring import HashRing
+
+
+class FakeQueue(list):
+    def put(self, item: Any) -> None:
+        self.append(item)
+
+
+class FakeProcess:
+    def __init__(self, target: Callable, args: Tuple, name: str, daemon: bool) -> None:
+        self.args = args
+        self.name = name
+        self.alive = False
+        self.terminated = False
+        self.exitcode: Optional[int] = None
+
+    def start(self) -> None:
+        self.alive = True
+
+    def is_alive(self) -> bool:
+        return self.alive
+
+    def terminate(self) -> None:
+        self.alive = False
+        self.terminated = True
+
+    def join(self) -> None:
+        pass
+
+
+class FakeMonotonic:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def processes(monkeypatch: pytest.MonkeyPatch) -> List[FakeProcess]:
+    started_processes: List[FakeProcess] = []
+
+    def build_process(**kwargs: Any) -> FakeProcess:
+        process = FakeProcess(**kwargs)
+        started_processes.append(process)
+        return process
+
+    monkeypatch.setattr(plextime_supervisor, "Process", build_process)
+    monkeypatch.setattr(plextime_supervisor, "Queue", FakeQueue)
+    return started_processes
+
+
+@pytest.fixture
+def monotonic(monkeypatch: pytest.MonkeyPatch) -> FakeMonotonic:
+    fake_monotonic = FakeMonotonic()
+    monkeypatch.setattr(restart_backoff, "monotonic", fake_monotonic)
+    return fake_monotonic
+
+
+def write_tenants(tenants_file: Path, users: List[str]) -> None:
+    with tenants_file.open("w", encoding="utf-8") as file:
+        dump([asdict(TenantSettings(user=user, password="password")) for user in users], file)
+
+
+def commands_by_worker(processes: List[FakeProcess]) -> Dict[str, List[Tuple[WorkerCommand, str]]]:
+    return {p.name: [(command, str(settings.user)) for command, settings in p.args[2]] for p in processes}
+
+
+def test_adding_a_worker_only_moves_the_tenants_it_takes_over(tmp_path: Path, processes: List[FakeProcess]) -> None:
+    users = [f"user{index}@plextime.test" for index in range(200)]
+    write_tenants(tmp_path / "tenants.json", users)
+    supervisor = PlextimeSupervisor(str(tmp_path / "tenants.json"), 4)
+    supervisor.launch()
+
+    supervisor.add_worker("worker-4")
+
+    moved_users = HashRing(f"worker-{index}" for index in range(5)).distribute(users)["worker-4"]
+    assert [p.name for p in processes] == ["worker-0", "worker-1", "worker-2", "worker-3", "worker-4"]
+    assert not any(p.terminated for p in processes)
+    assert sorted(user for p in processes[:4] for _, user in commands_by_worker(processes)[p.name]) == sorted(
+        moved_users,
+    )
+    assert all(command == WorkerCommand.REMOVE_TENANT for p in processes[:4] for command, _ in p.args[2])
+    assert sorted(str(settings.user) for settings in processes[4].args[1]) == sorted(moved_users)
+
+
+def test_removing_a_worker_hands_its_tenants_over(tmp_path: Path, processes: List[FakeProcess]) -> None:
+    users = [f"user{index}@plextime.test" for index in range(200)]
+    write_tenants(tmp_path / "tenants.json", users)
+    supervisor = PlextimeSupervisor(str(tmp_path / "tenants.json"), 3)
+    supervisor.launch()
+
+    supervisor.remove_worker("worker-2")
+
+    moved_users = [str(settings.user) for settings in processes[2].args[1]]
+    handed_over = [
+        user
+        for p in processes[:2]
+        for command, user in commands_by_worker(processes)[p.name]
+        if command == WorkerCommand.ADD_TENANT
+    ]
+    assert processes[2].terminated
+    assert not processes[0].terminated
+    assert not processes[1].terminated
+    assert sorted(handed_over) == sorted(moved_users)
+
+
+def test_an_empty_worker_is_started_once_it_gets_a_tenant(tmp_path: Path, processes: List[FakeProcess]) -> None:
+    tenants_file = tmp_path / "tenants.json"
+    hash_ring = HashRing(["worker-0", "worker-1"])
+    users = [f"user{index}@plextime.test" for index in range(20)]
+    first_user = next(user for user in users if hash_ring.get_node(user) == "worker-0")
+    second_user = next(user for user in users if hash_ring.get_node(user) == "worker-1")
+    write_tenants(tenants_file, [first_user])
+    supervisor = PlextimeSupervisor(str(tenants_file), 2)
+    supervisor.launch()
+
+    assert [p.name for p in processes] == ["worker-0"]
+
+    write_tenants(tenants_file, [first_user, second_user])
+    os.utime(tenants_file, (tenants_file.stat().st_atime, tenants_file.stat().st_mtime + 1))
+    supervisor.poll()
+
+    assert [p.name for p in processes] == ["worker-0", "worker-1"]
+    assert [str(settings.user) for settings in processes[1].args[1]] == [second_user]
+    assert processes[0].args[2] == []
+
+
+def test_a_crashing_worker_is_restarted_with_backoff(
+    tmp_path: Path,
+    processes: List[FakeProcess],
+    monotonic: FakeMonotonic,
+) -> None:
+    write_tenants(tmp_path / "tenants.json", ["user@plextime.test"])
+    supervisor = PlextimeSupervisor(str(tmp_path / "tenants.json"), 1)
+    supervisor.launch()
+
+    delays = []
+    for _ in range(3):
+        processes[-1].alive = False
+        supervisor.poll()
+        restarted_at = monotonic.now
+        while len(processes) == len(delays) + 1:
+            monotonic.now += 1
+            supervisor.poll()
+        delays.append(monotonic.now - restarted_at)
+
+    assert delays == [
+        plextime_supervisor.PLEXTIME_WORKERS_POLL_INTERVAL,
+        plextime_supervisor.PLEXTIME_WORKERS_POLL_INTERVAL * 2,
+        plextime_supervisor.PLEXTIME_WORKERS_POLL_INTERVAL * 4,
+    ]
+    assert [p.name for p in processes] == ["worker-0"] * 4
+
+
+def test_tenants_file_changes_are_sent_to_the_worker(tmp_path: Path, processes: List[FakeProcess]) -> None:
+    tenants_file = tmp_path / "tenants.json"
+    write_tenants(tenants_file, ["kept@plextime.test", "updated@plextime.test", "removed@plextime.test"])
+    supervisor = PlextimeSupervisor(str(tenants_file), 1)
+    supervisor.launch()
+
+    with tenants_file.open("w", encoding="utf-8") as file:
+        dump(
+            [
+                asdict(TenantSettings(user="kept@plextime.test", password="password")),
+                asdict(TenantSettings(user="updated@plextime.test", password="password", checkin_random_margin=60)),
+                asdict(TenantSettings(user="added@plextime.test", password="password")),
+            ],
+            file,
+        )
+    os.utime(tenants_file, (tenants_file.stat().st_atime, tenants_file.stat().st_mtime + 1))
+    supervisor.poll()
+
+    assert sorted(commands_by_worker(processes)["worker-0"], key=lambda command: command[0].value) == [
+        (WorkerCommand.ADD_TENANT, "added@plextime.test"),
+        (WorkerCommand.REMOVE_TENANT, "removed@plextime.test"),
+        (WorkerCommand.UPDATE_TENANT, "updated@plextime.test"),
+    ]
+    assert processes[0].args[2][-1][1].checkin_random_margin == 60
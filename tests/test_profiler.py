@@ -0,0 +1,142 @@
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pytest
+
+from plextime_bot.utils import profiler
+from plextime_bot.utils.profiler import JobTiming, profiled_job, profiled_phase, profiled_tenant
+
+
+class FakePerfCounter:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def perf_counter(monkeypatch: pytest.MonkeyPatch) -> FakePerfCounter:
+    fake_perf_counter = FakePerfCounter()
+    monkeypatch.setattr(profiler, "perf_counter", fake_perf_counter)
+    return fake_perf_counter
+
+
+@pytest.fixture
+def logged_jobs(monkeypatch: pytest.MonkeyPatch) -> List[Tuple[Optional[str], List[JobTiming]]]:
+    jobs: List[Tuple[Optional[str], List[JobTiming]]] = []
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING", True)
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profiler, "_log_phases", lambda tenant, timings: jobs.append((tenant, timings)))
+    return jobs
+
+
+def test_functions_are_left_untouched_when_profiling_is_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING", False)
+
+    def check() -> None:
+        pass
+
+    assert profiled_job("check")(check) is check
+    assert profiled_phase("write")(check) is check
+
+
+def test_phases_add_up_inside_a_job(
+    perf_counter: FakePerfCounter,
+    logged_jobs: List[Tuple[Optional[str], List[JobTiming]]],
+) -> None:
+    @profiled_phase("auth")
+    def auth() -> None:
+        perf_counter.now += 0.2
+
+    @profiled_phase("write")
+    def write() -> None:
+        perf_counter.now += 0.3
+
+    @profiled_job("checkin")
+    def checkin() -> None:
+        auth()
+        write()
+        write()
+        perf_counter.now += 0.1
+
+    with profiled_tenant("janedoe"):
+        checkin()
+
+    [(tenant, [(name, elapsed_time, phases)])] = logged_jobs
+    assert (tenant, name) == ("janedoe", "checkin")
+    assert elapsed_time == pytest.approx(0.9)
+    assert phases == pytest.approx({"auth": 0.2, "write": 0.6})
+
+
+def test_nested_jobs_are_not_counted_twice(
+    perf_counter: FakePerfCounter,
+    logged_jobs: List[Tuple[Optional[str], List[JobTiming]]],
+) -> None:
+    @profiled_phase("auth")
+    def auth() -> None:
+        perf_counter.now += 0.2
+
+    @profiled_job("prewarm")
+    def prewarm() -> None:
+        auth()
+
+    @profiled_job("checkin")
+    def checkin() -> None:
+        prewarm()
+        auth()
+
+    checkin()
+
+    [(_, [(name, elapsed_time, phases)])] = logged_jobs
+    assert name == "checkin"
+    assert elapsed_time == pytest.approx(0.4)
+    assert phases == pytest.approx({"auth": 0.4})
+
+
+def test_leading_jobs_are_logged_with_the_job_that_follows(
+    perf_counter: FakePerfCounter,
+    logged_jobs: List[Tuple[Optional[str], List[JobTiming]]],
+) -> None:
+    @profiled_job("prewarm", leading=True)
+    def prewarm() -> None:
+        perf_counter.now += 0.2
+
+    @profiled_job("checkin")
+    def checkin() -> None:
+        perf_counter.now += 0.1
+
+    with profiled_tenant("janedoe"):
+        prewarm()
+        assert logged_jobs == []
+        perf_counter.now += 60
+        checkin()
+
+    [(tenant, timings)] = logged_jobs
+    assert tenant == "janedoe"
+    assert [(name, round(elapsed_time, 3)) for name, elapsed_time, _ in timings] == [("prewarm", 0.2), ("checkin", 0.1)]
+
+
+def test_sample_rates_out_of_range_are_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING", True)
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING_SAMPLE_RATE", 1.5)
+
+    with pytest.raises(ValueError, match="PLEXTIME_PROFILING_SAMPLE_RATE"):
+        profiled_job("checkin")(lambda: None)
+
+
+def test_rotation_keeps_whole_dumps(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiler, "PLEXTIME_PROFILING_MAX_FILES", 2)
+    dumps = [f"2024031{index}080000000000-checkin-janedoe" for index in range(4)]
+    for index, base_name in enumerate(dumps):
+        for extension in ("prof", "tracemalloc.txt"):
+            profile = tmp_path / f"{base_name}.{extension}"
+            profile.write_text("", encoding="utf-8")
+            os.utime(profile, (index, index))
+
+    profiler._rotate_profiles(tmp_path)
+
+    assert sorted(profile.name for profile in tmp_path.iterdir()) == [
+        f"{base_name}.{extension}" for base_name in dumps[2:] for extension in ("prof", "tracemalloc.txt")
+    ]